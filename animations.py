@@ -6,6 +6,7 @@ import os
 from colors import E_NULL, E_FIRE, E_WATER, E_LEAF, E_AIR, C_WHITE
 from config import WIDTH, HEIGHT
 from fonts import FONT_DMG
+from game_grid import cell_center
 
 # Load animation data from JSON
 def load_animation_data():
@@ -19,6 +20,12 @@ def load_animation_data():
 
 ANIMATION_TYPES = load_animation_data()
 
+EFFECT_TEXT_MERGE = 20   # frames a tile's effect text keeps adding up ticks
+
+# Cosmetic randomness only (particles, shake, glitches). Game rules use the
+# per-game RNG on engine.Game, so visuals never change a game's outcome.
+fx_rng = random.Random()
+
 class Particle:
     def __init__(self, x, y, color, size, velocity, life):
         self.x, self.y = x, y
@@ -28,8 +35,8 @@ class Particle:
         self.life = life
         self.max_life = life
         self.gravity = 0
-        self.rotation = random.uniform(0, 360)
-        self.rot_speed = random.uniform(-5, 5)
+        self.rotation = fx_rng.uniform(0, 360)
+        self.rot_speed = fx_rng.uniform(-5, 5)
 
     def update(self):
         self.x += self.vx
@@ -93,7 +100,7 @@ class BeamEffect:
     def update(self):
         self.progress += 0.05
         self.life -= 1
-        self.glitch_offset = random.randint(-5, 5)
+        self.glitch_offset = fx_rng.randint(-5, 5)
         
     def draw(self, surf):
         if self.life <= 0:
@@ -227,10 +234,10 @@ class HealEffect:
         
         for _ in range(particle_count):
             self.particles.append({
-                'x': x + random.randint(-30, 30),
-                'y': y + random.randint(-30, 30),
-                'vy': random.uniform(-2, -1),
-                'size': random.randint(3, 6),
+                'x': x + fx_rng.randint(-30, 30),
+                'y': y + fx_rng.randint(-30, 30),
+                'vy': fx_rng.uniform(-2, -1),
+                'size': fx_rng.randint(3, 6),
                 'alpha': 255
             })
     
@@ -256,14 +263,14 @@ class SteamEffect:
         self.life = 30
         
         for _ in range(25):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(1, 3)
+            angle = fx_rng.uniform(0, math.pi * 2)
+            speed = fx_rng.uniform(1, 3)
             self.particles.append({
                 'x': x,
                 'y': y,
                 'vx': math.cos(angle) * speed,
                 'vy': math.sin(angle) * speed - 1,
-                'size': random.randint(4, 10),
+                'size': fx_rng.randint(4, 10),
                 'alpha': 200
             })
     
@@ -296,8 +303,8 @@ class GlitchEffect:
         
     def update(self):
         self.life -= 1
-        self.glitch_lines = [(random.randint(-self.size, self.size), 
-                              random.randint(-self.size, self.size)) for _ in range(5)]
+        self.glitch_lines = [(fx_rng.randint(-self.size, self.size), 
+                              fx_rng.randint(-self.size, self.size)) for _ in range(5)]
         
     def draw(self, surf):
         if self.life <= 0:
@@ -306,8 +313,8 @@ class GlitchEffect:
         
         # Glitch squares
         for gx, gy in self.glitch_lines:
-            size = random.randint(5, 20)
-            color = self.color if random.random() > 0.5 else self.glitch_color
+            size = fx_rng.randint(5, 20)
+            color = self.color if fx_rng.random() > 0.5 else self.glitch_color
             rect = pygame.Rect(self.x + gx - size//2, self.y + gy - size//2, size, size)
             s = pygame.Surface((size, size), pygame.SRCALPHA)
             s.fill((*color, alpha))
@@ -360,13 +367,13 @@ class SplashEffect:
         self.life = 30
         self.droplets = []
         for _ in range(droplet_count):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(2, 5)
+            angle = fx_rng.uniform(0, math.pi * 2)
+            speed = fx_rng.uniform(2, 5)
             self.droplets.append({
                 'x': float(x), 'y': float(y),
                 'vx': math.cos(angle) * speed,
                 'vy': math.sin(angle) * speed - 2,
-                'size': random.randint(3, 7),
+                'size': fx_rng.randint(3, 7),
                 'alpha': 255
             })
 
@@ -479,21 +486,22 @@ class AnimationManager:
         self.screenshake = 0
         self.projectiles = []
         self.floating_texts = []
+        self.effect_texts = {}      # tile -> its live effect-totals text
         self.special_effects = []  # New: for complex effects
         self.blocking = False
 
     def add_particle(self, x, y, element):
-        vx = random.uniform(-2, 2)
-        vy = random.uniform(-2, 2)
-        size = random.uniform(3, 6)
-        life = random.randint(20, 40)
+        vx = fx_rng.uniform(-2, 2)
+        vy = fx_rng.uniform(-2, 2)
+        size = fx_rng.uniform(3, 6)
+        life = fx_rng.randint(20, 40)
         
         color = E_NULL
         if element == 'fire': 
-            color = (255, random.randint(50, 150), 0)
+            color = (255, fx_rng.randint(50, 150), 0)
             vy -= 1
         elif element == 'water': 
-            color = (50, 100, random.randint(200, 255))
+            color = (50, 100, fx_rng.randint(200, 255))
             vy += 0.5
         elif element == 'leaf':
             color = (50, 255, 50)
@@ -501,9 +509,9 @@ class AnimationManager:
             color = (220, 255, 255)
             vx *= 2
         elif element == 'null':
-            color = (180, 100, random.randint(200, 255))
+            color = (180, 100, fx_rng.randint(200, 255))
         elif element == 'combined':
-            color = (255, random.randint(150, 200), 100)
+            color = (255, fx_rng.randint(150, 200), 100)
 
         p = Particle(x, y, color, size, (vx, vy), life)
         if element == 'water': p.gravity = 0.1
@@ -607,7 +615,36 @@ class AnimationManager:
         self.blocking = True
 
     def add_floating_text(self, text, x, y, color=C_WHITE):
-        self.floating_texts.append({'text': text, 'x': x, 'y': y, 'life': 60, 'color': color})
+        ft = {'text': text, 'x': x, 'y': y, 'life': 60, 'color': color}
+        self.floating_texts.append(ft)
+        return ft
+
+    def add_effect_totals(self, pos, dmg, heal):
+        """
+        Persistent-effect ticks on a tile add up in one floating text while
+        it is fresh, instead of a new text every tick.
+        """
+        ft = self.effect_texts.get(pos)
+        if ft is None or ft['life'] < 60 - EFFECT_TEXT_MERGE:
+            ft = self.add_floating_text("", *cell_center(*pos))
+            ft['dmg'] = ft['heal'] = 0
+            self.effect_texts[pos] = ft
+        ft['dmg'] += dmg
+        ft['heal'] += heal
+        parts = []
+        if ft['dmg']:
+            parts.append(f"-{ft['dmg']}")
+        if ft['heal']:
+            parts.append(f"+{ft['heal']}")
+        ft['text'] = " ".join(parts)
+        ft['color'] = E_FIRE if ft['dmg'] >= ft['heal'] else E_LEAF
+
+    def on_engine_event(self, kind, data):
+        """events listener: turn engine events into visuals."""
+        if kind == "text":
+            self.add_floating_text(data["text"], *cell_center(*data["pos"]), data.get("color", C_WHITE))
+        elif kind == "effects":
+            self.add_effect_totals(data["pos"], data["dmg"], data["heal"])
 
     def update(self):
         if self.screenshake > 0:
@@ -658,8 +695,8 @@ class AnimationManager:
                 self.floating_texts.remove(ft)
 
     def draw(self, surf):
-        shake_x = random.randint(-self.screenshake, self.screenshake)
-        shake_y = random.randint(-self.screenshake, self.screenshake)
+        shake_x = fx_rng.randint(-self.screenshake, self.screenshake)
+        shake_y = fx_rng.randint(-self.screenshake, self.screenshake)
         
         temp_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         
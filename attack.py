@@ -1,9 +1,47 @@
 from dataclasses import dataclass
 
-@dataclass
+from logic_attack import BEHAVIORS
+
+@dataclass(frozen=True, slots=True)
 class Attack:
     name: str
     dmg: int
     element: str = "null"  # fire, water, leaf, air, null, combined
     attack_range: int = 3
     animation: str = "projectile_fire"  # Animation type from cards.json
+    behavior: str = "strike"    # resolver in logic_attack.BEHAVIORS
+
+
+# Definitions without a "behavior" key: the specials the rules used to
+# recognise by name, and heals by "heal" in the name or animation.
+LEGACY_BEHAVIORS = {
+    "Burning Trail": "fire_trail",
+    "Nature's Embrace": "embrace",
+    "Burning-Embrace Fusion": "fusion_embrace",
+}
+
+
+def default_behavior(name, animation):
+    if name in LEGACY_BEHAVIORS:
+        return LEGACY_BEHAVIORS[name]
+    if "heal" in name.lower() or "heal" in (animation or "").lower():
+        return "heal"
+    return "strike"
+
+
+# Attacks never change after creation, so identical definitions share one
+# object instead of every card carrying its own copies.
+_interned = {}
+
+def make_attack(name, dmg, element="null", attack_range=3, animation="projectile_fire",
+                behavior=None):
+    """Return the shared Attack for this definition, creating it once."""
+    if behavior is None:
+        behavior = default_behavior(name, animation)
+    elif behavior not in BEHAVIORS:
+        raise ValueError(f"unknown attack behavior {behavior!r} for {name!r}")
+    key = (name, dmg, element, attack_range, animation, behavior)
+    atk = _interned.get(key)
+    if atk is None:
+        atk = _interned[key] = Attack(*key)
+    return atk
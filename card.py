@@ -1,26 +1,30 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
-from attack import Attack
+from card_features import CardFeatures, features_for
 
-@dataclass
+# Rule state only — flash timers and the animated HP bar live in
+# card_view.CardView so simulations never pay for them.
+@dataclass(slots=True, eq=False)
 class Card:
     owner: str
     name: str
     hp: int
     max_hp: int
-    attacks: list
+    attacks: tuple          # shared, interned Attack objects
     move_range: int = 2
     element: str = "null" # Base element of the card
     index: int = 0
-    flash_timer: int = 0
     shield: int = 0
-    display_hp: int = None   # animated hp
     rarity: str = "normal"   # normal / rare / epic / legendary
-    heal_flash_timer: int = 0
     healed_once: bool = False   # 🔥 HEAL ONLY ONCE
+    # Derived from attacks once, read by the CPU evaluators
+    features: Optional[CardFeatures] = field(default=None, repr=False)
 
+    def __post_init__(self):
+        self.features = features_for(self.attacks)
 
-@dataclass
+
+@dataclass(slots=True)
 class Tile:
     col: int
     row: int
@@ -0,0 +1,68 @@
+"""
+Precomputed per-card features for the CPU evaluators (headless).
+
+Everything the greedy / search evaluators ask of a card's attacks is a
+pure function of its attack tuple, so it is worked out once, when the
+card is created (Card.features), and shared by every card with the same
+attacks — cards from one cards.json entry share one tuple of interned
+Attacks, and with it one CardFeatures.
+"""
+from dataclasses import dataclass
+
+from logic_attack import is_heal_attack
+
+
+@dataclass(frozen=True, slots=True)
+class CardFeatures:
+    max_dmg: int            # strongest attack, heals included (threat)
+    reach: int              # longest attack_range
+    heal_flags: tuple       # is_heal_attack per attack, in card order
+    heals: tuple            # the heal attacks
+    offensive: tuple        # non-heal attacks, strongest first
+    best_at: tuple          # distance d (0..reach) -> best offensive attack or None
+
+    @property
+    def has_heal(self):
+        return bool(self.heals)
+
+
+def offense_score(atk):
+    """Offensive pick score (select_attack_placement): damage, fire bonus."""
+    score = atk.dmg
+    if atk.element == "fire":
+        score += 2
+    return score
+
+
+_interned = {}
+
+def features_for(attacks):
+    """The shared CardFeatures of this attack tuple, built on first use."""
+    attacks = tuple(attacks)
+    feats = _interned.get(attacks)
+    if feats is not None:
+        return feats
+
+    heal_flags = tuple(is_heal_attack(a) for a in attacks)
+    offensive = [a for a, heal in zip(attacks, heal_flags) if not heal]
+    reach = max((a.attack_range for a in attacks), default=0)
+
+    # Range buckets: first attack (card order) with the best score that
+    # still reaches distance d — the same pick as the per-call loop.
+    best_at = []
+    for d in range(reach + 1):
+        best, best_score = None, -1
+        for a in offensive:
+            if d <= a.attack_range and offense_score(a) > best_score:
+                best, best_score = a, offense_score(a)
+        best_at.append(best)
+
+    feats = _interned[attacks] = CardFeatures(
+        max_dmg=max((a.dmg for a in attacks), default=0),
+        reach=reach,
+        heal_flags=heal_flags,
+        heals=tuple(a for a, heal in zip(attacks, heal_flags) if heal),
+        offensive=tuple(sorted(offensive, key=lambda a: -a.dmg)),
+        best_at=tuple(best_at),
+    )
+    return feats
@@ -0,0 +1,41 @@
+"""
+GUI-side view state for cards on the board.
+
+Card holds rule state only; the hit/heal flash timers and the HP value
+drawn on the bar live here, keyed by card identity and driven by engine
+events, so the headless engine and simulations never carry them.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class CardView:
+    flash_timer: int = 0
+    heal_flash_timer: int = 0
+    display_hp: int = None   # animated hp
+
+
+_views = {}
+
+
+def view_of(card):
+    """Return the CardView for a card, creating it on first use."""
+    view = _views.get(card)
+    if view is None:
+        view = _views[card] = CardView(display_hp=card.hp)
+    return view
+
+
+def clear_views():
+    """Forget all views (new game)."""
+    _views.clear()
+
+
+def on_engine_event(kind, data):
+    """events listener: start hit/heal flashes."""
+    if kind == "flash":
+        view = view_of(data["card"])
+        if data.get("heal"):
+            view.heal_flash_timer = data["frames"]
+        else:
+            view.flash_timer = data["frames"]
@@ -5,6 +5,33 @@ TILE_SIZE = 64          # 8 × 8px grid units
 WIDTH = GRID_COLS * TILE_SIZE   # 1472px
 HEIGHT = GRID_ROWS * TILE_SIZE + 260  # +260 for bottom panel
 FPS = 60
+# Rules time: persistent effects (fire trails, regen, burn) advance on a
+# fixed logical clock of TICK_RATE ticks per second, whatever the frame
+# rate; durations and per-tick amounts are in these ticks.
+TICK_RATE = 60
+
+# CPU difficulty levels. "greedy" is advanced_cpu; "alphabeta" searches
+# with iterative deepening until max_depth or budget_ms (per turn) is hit;
+# "mcts" runs playouts until either budget is spent.
+CPU_LEVELS = {
+    "easy":   {"cpu": "greedy"},
+    "normal": {"cpu": "alphabeta", "budget_ms": 4, "max_depth": 2},
+    "hard":   {"cpu": "alphabeta", "budget_ms": 10, "max_depth": 4},
+    "expert": {"cpu": "alphabeta", "budget_ms": 40, "max_depth": 8},
+    # MCTS: plays out the damage rolls and burn/regen; runs in cpu_worker
+    "master": {"cpu": "mcts", "playouts": 4000, "budget_ms": 400},
+}
+CPU_DIFFICULTY = "easy"   # enemy controller in the GUI
+
+# Draft: the CPU drafts with draft_solver (exact minimax on learned card
+# strengths) instead of the threshold heuristic. Solved positions are
+# cached in DRAFT_CACHE_FILE (relative to the game folder; None = memory only).
+DRAFT_SOLVER = True
+DRAFT_CACHE_FILE = ".draft_cache.json"
+
+# Decision log (decision_log.py): "debug" / "info" / "warning" / "off"
+DECISION_LOG_LEVEL = "warning"
+DECISION_LOG_FILE = None      # e.g. "decisions.jsonl" for a JSON-lines dump
 
 # 8px Grid System
 GRID_UNIT = 8
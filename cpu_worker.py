@@ -0,0 +1,130 @@
+"""
+Background CPU thinking (headless).
+
+Searching CPUs can take longer than a frame, so the GUI never calls them
+on its own thread. CpuWorker hands a private copy of the board
+(Grid.clone()) to a worker and the main loop keeps animating; poll()
+returns the finished turn (engine.decide_turn: one action, or a planner's
+whole plan) mapped onto the live board's cards and attacks. If a unit died or moved while the CPU was thinking (the board's
+occupancy version moved on), the stale decision is thrown away and the
+CPU thinks again on a fresh copy.
+
+The worker is a forked process on Linux, so a deep search never competes
+with rendering for the GIL. Each controller
+is built once per process from its spec (Game.cpu_spec: kind, seed,
+settings — the same controller the game would build) and keeps its
+transposition table between turns; reset() drops them when a new game
+starts. Elsewhere it falls back to a thread: Windows has no fork (a
+spawned child would re-run main.py), and on macOS forking after
+pygame/SDL and Cocoa started can crash or hang the child.
+"""
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from engine import decide_turn, make_cpu
+
+_controllers = {}   # per worker: cpu spec -> controller
+
+
+def _decide(spec, grid, side):
+    cpu = _controllers.get(spec)
+    if cpu is None:
+        kind, seed, settings = spec
+        cpu = _controllers[spec] = make_cpu(kind, seed=seed, **dict(settings))
+    return decide_turn(cpu, grid, side)
+
+
+def _forget_controllers():
+    for cpu in _controllers.values():
+        close = getattr(cpu, "close", None)
+        if close:
+            close()
+    _controllers.clear()
+
+
+def can_fork():
+    """Fork worker processes only on Linux (unsafe on macOS, absent on Windows)."""
+    return sys.platform.startswith("linux") and "fork" in multiprocessing.get_all_start_methods()
+
+
+def _new_pool():
+    if can_fork():
+        return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork"))
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="cpu")
+
+
+class CpuWorker:
+    def __init__(self):
+        self._pool = None
+        self._future = None
+        self._game = None
+        self._side = None
+        self._version = None
+
+    @property
+    def busy(self):
+        return self._future is not None
+
+    def start(self, game, side="enemy"):
+        """Begin deciding game's next turn for `side` (no-op while busy)."""
+        if self._future is not None:
+            return
+        if self._pool is None:
+            self._pool = _new_pool()
+        self._game, self._side = game, side
+        self._version = game.grid.version
+        self._future = self._pool.submit(_decide, game.cpu_spec[side], game.grid.clone(), side)
+
+    def cancel(self):
+        """Forget the pending decision. The worker just finishes."""
+        self._future = None
+        self._game = None
+
+    def reset(self):
+        """
+        New game: forget the pending decision and the worker's controllers
+        (transposition tables, reused search trees). The single worker runs
+        the reset after whatever it is still thinking about.
+        """
+        self.cancel()
+        if self._pool is not None:
+            self._pool.submit(_forget_controllers)
+
+    def poll(self):
+        """
+        (False, None) while thinking (or idle); (True, actions) once decided.
+        The actions' cards and attacks are the live ones; [] = pass.
+        """
+        future = self._future
+        if future is None or not future.done():
+            return False, None
+        game, side = self._game, self._side
+        self._future = None
+        actions = future.result()
+
+        grid = game.grid
+        if grid.version != self._version:
+            self.start(game, side)
+            return False, None
+        live = []
+        for action in actions:
+            # by unit, not tile: a plan's later steps start where earlier ones end
+            c, r = grid.find_unit(action['card'].owner, action['card'].index)
+            card = grid.tiles[c][r].card
+            action = dict(action, card=card)
+            if 'attack' in action:
+                # Attack is a frozen dataclass: equal fields = same attack
+                action['attack'] = next(a for a in card.attacks if a == action['attack'])
+            live.append(action)
+        return True, live
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._future = None
+
+
+# The GUI's worker (one CPU opponent at a time)
+cpu_worker = CpuWorker()
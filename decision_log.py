@@ -0,0 +1,87 @@
+"""
+Structured, level-gated decision log (headless).
+
+Rules and AI code record *what* was decided as flat key/value records
+instead of printing formatted strings:
+
+    if decision_log.enabled(DEBUG):
+        decision_log.log(DEBUG, "cpu_candidate", unit=card.name, score=s)
+
+Callers check enabled() before building the record, so a disabled level
+costs one integer compare — nothing is formatted or written. Records go
+to the console (human readable) and/or a JSON-lines sink, one object per
+line:  {"level": "debug", "event": "cpu_candidate", "unit": ..., ...}
+
+Levels: DEBUG (every candidate), INFO (chosen actions), WARNING, OFF.
+Default is WARNING, i.e. silent during normal play and simulation.
+"""
+import json
+import sys
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning", OFF: "off"}
+_LEVELS_BY_NAME = {name: lvl for lvl, name in LEVEL_NAMES.items()}
+
+level = WARNING       # minimum level that gets recorded at all
+console = True        # echo records to stdout
+_sink = None          # open JSON-lines file, or None
+_context = {}         # fields merged into every record (e.g. game seed)
+
+
+def parse_level(name):
+    """'debug' / 'info' / 'warning' / 'off' (or an int) -> level."""
+    if isinstance(name, int):
+        return name
+    return _LEVELS_BY_NAME[name.lower()]
+
+
+def set_level(lvl):
+    global level
+    level = parse_level(lvl)
+
+
+def enabled(lvl):
+    """True if records at `lvl` would be kept. Check before building one."""
+    return lvl >= level
+
+
+def open_sink(path, echo=False):
+    """Append records to `path` as JSON lines; `echo` keeps the console too."""
+    global _sink, console
+    close_sink()
+    # line-buffered append: each record is a single write, so several
+    # simulator worker processes can share one file
+    _sink = open(path, "a", buffering=1, encoding="utf-8")
+    console = echo
+
+
+def close_sink():
+    global _sink, console
+    if _sink is not None:
+        _sink.close()
+        _sink = None
+    console = True
+
+
+def bind(**fields):
+    """Set fields added to every following record (None removes one)."""
+    for k, v in fields.items():
+        if v is None:
+            _context.pop(k, None)
+        else:
+            _context[k] = v
+
+
+def log(lvl, event, **fields):
+    if lvl < level:
+        return
+    record = {"level": LEVEL_NAMES.get(lvl, lvl), "event": event, **_context, **fields}
+    if _sink is not None:
+        _sink.write(json.dumps(record, default=str) + "\n")
+    if console:
+        body = " ".join(f"{k}={v}" for k, v in record.items() if k not in ("level", "event"))
+        print(f"[{record['level']}] {event} {body}", file=sys.stdout)
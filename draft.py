@@ -0,0 +1,235 @@
+"""
+Draft (stealing phase) rules — headless.
+Each player gets 5 cards, then STEAL or RETAIN until both have 3.
+StealingPhase (stealing_phase.py) draws this state and feeds it clicks.
+"""
+import random
+import os
+import json
+import decision_log
+from decision_log import INFO
+from card import Card
+from attack import make_attack
+
+# ═══════════════════════════════════════
+# JSON Card Pool
+# ═══════════════════════════════════════
+def load_card_data():
+    json_path = os.path.join(os.path.dirname(__file__), "cards.json")
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+    return data["cards"]
+
+CARD_POOL = load_card_data()
+
+# One immutable attack tuple per cards.json entry, shared by every card
+# built from it.
+POOL_ATTACKS = [
+    tuple(make_attack(a["name"], a["damage"], a["element"], a["range"],
+                      a.get("animation", "projectile_fire"), a.get("behavior"))
+          for a in data.get("attacks", []))
+    for data in CARD_POOL
+]
+
+
+class Draft:
+    def __init__(self, rng=None, solver=None):
+        # Pass the game's RNG to make the deal reproducible
+        self.rng = rng or random.Random()
+        # Optional draft_solver.DraftSolver for the CPU's picks
+        self.solver = solver
+        self.reset()
+
+    def reset(self):
+        shuffled = self.rng.sample(range(len(CARD_POOL)), min(10, len(CARD_POOL)))
+        self.player_hand = shuffled[:5]
+        self.cpu_hand = shuffled[5:10]
+        self.player_deck = []
+        self.cpu_deck = []
+        self.current_turn = "player"
+        self.phase_complete = False
+        self.action_message = "Your turn: Click YOUR card to RETAIN or OPPONENT's card to STEAL"
+
+    def get_card_data(self, idx):
+        return CARD_POOL[idx]
+
+    # ═══════════════════════════════════════
+    # PLAYER ACTIONS
+    # ═══════════════════════════════════════
+    def retain_card(self, owner, idx):
+        if owner == "player" and len(self.player_deck) < 3:
+            card_idx = self.player_hand.pop(idx)
+            self.player_deck.append(card_idx)
+            self.action_message = f"Retained {CARD_POOL[card_idx]['name']}!"
+            self._log_pick("player", "retain", card_idx)
+            self.end_turn()
+
+    def steal_card(self, idx):
+        if len(self.player_deck) < 3 and idx < len(self.cpu_hand):
+            card_idx = self.cpu_hand.pop(idx)
+            self.player_deck.append(card_idx)
+            self.action_message = f"Stole {CARD_POOL[card_idx]['name']}!"
+            self._log_pick("player", "steal", card_idx)
+            self.end_turn()
+
+    def _log_pick(self, side, action, card_idx, discarded=None, **fields):
+        if decision_log.enabled(INFO):
+            if discarded is not None:
+                fields["discarded"] = CARD_POOL[discarded]["name"]
+            decision_log.log(INFO, "draft_pick", side=side, action=action,
+                             card=CARD_POOL[card_idx]["name"], **fields)
+
+    def end_turn(self):
+        self.check_phase_complete()
+        if not self.phase_complete:
+            self.current_turn = "cpu" if self.current_turn == "player" else "player"
+            if self.current_turn == "cpu":
+                self.on_cpu_turn()
+
+    def on_cpu_turn(self):
+        """Hook: the GUI schedules cpu_turn() on a timer; headless callers just call it."""
+
+    # ═══════════════════════════════════════
+    # CPU HEURISTIC
+    # ═══════════════════════════════════════
+    def _card_score(self, card_idx):
+        data = CARD_POOL[card_idx]
+        return data["hp"] + sum(a["damage"] for a in data.get("attacks", []))
+
+    def cpu_turn(self):
+        self.auto_turn("cpu")
+
+    def solver_turn(self):
+        """The CPU's pick from the draft solver (retain or steal, else pass)."""
+        value, pick = self.solver.best_pick("cpu", self.player_hand, self.cpu_hand,
+                                            self.player_deck, self.cpu_deck)
+        if pick is None:
+            self.current_turn = "player"
+            return
+        action, card_idx = pick
+        if action == "retain":
+            self.cpu_hand.remove(card_idx)
+            self.action_message = f"CPU retained {CARD_POOL[card_idx]['name']}"
+        else:
+            self.player_hand.remove(card_idx)
+            self.action_message = f"CPU stole {CARD_POOL[card_idx]['name']}!"
+        self.cpu_deck.append(card_idx)
+        self._log_pick("cpu", action, card_idx, value=round(value, 4))
+        self.end_turn()
+
+    def auto_turn(self, side):
+        """
+        Threshold heuristic on _card_score for `side` ("cpu" or "player").
+        The player side is only auto-played by the simulator. With a solver,
+        the CPU's picks come from it instead.
+        """
+        if side == "cpu" and self.solver is not None:
+            self.solver_turn()
+            return
+
+        if side == "cpu":
+            hand, deck, opp_hand, other, who = self.cpu_hand, self.cpu_deck, self.player_hand, "player", "CPU"
+        else:
+            hand, deck, opp_hand, other, who = self.player_hand, self.player_deck, self.cpu_hand, "cpu", "Player"
+
+        opp_scores = [(self._card_score(ci), i) for i, ci in enumerate(opp_hand)]
+        own_scores = [(self._card_score(ci), i) for i, ci in enumerate(hand)]
+        opp_scores.sort(key=lambda x: x[0], reverse=True)
+        own_scores.sort(key=lambda x: x[0])
+
+        # Aggressive steal
+        if opp_scores and own_scores:
+            best_ps, best_pi = opp_scores[0]
+            worst_cs, worst_ci = own_scores[0]
+            if best_ps > worst_cs + 20:
+                stolen = opp_hand.pop(best_pi)
+                if len(deck) < 3:
+                    deck.append(stolen)
+                    self.action_message = f"{who} aggressively stole {CARD_POOL[stolen]['name']}!"
+                    self._log_pick(side, "steal", stolen, score=best_ps)
+                    self.end_turn()
+                    return
+                else:
+                    worst_ds, worst_di = 99999, -1
+                    for i, ci in enumerate(deck):
+                        s = self._card_score(ci)
+                        if s < worst_ds:
+                            worst_ds, worst_di = s, i
+                    disc = deck.pop(worst_di)
+                    deck.append(stolen)
+                    self.action_message = f"{who} swapped {CARD_POOL[disc]['name']} for {CARD_POOL[stolen]['name']}!"
+                    self._log_pick(side, "swap", stolen, discarded=disc, score=best_ps)
+                    self.end_turn()
+                    return
+
+        if len(deck) >= 3:
+            if opp_hand:
+                best_ss, best_si = 0, -1
+                for i, ci in enumerate(opp_hand):
+                    s = self._card_score(ci)
+                    if s > best_ss:
+                        best_ss, best_si = s, i
+                worst_ds, worst_di = 9999, -1
+                for i, ci in enumerate(deck):
+                    s = self._card_score(ci)
+                    if s < worst_ds:
+                        worst_ds, worst_di = s, i
+                if best_ss > worst_ds + 15:
+                    stolen = opp_hand.pop(best_si)
+                    disc = deck.pop(worst_di)
+                    deck.append(stolen)
+                    self.action_message = f"{who} SWAPPED for {CARD_POOL[stolen]['name']}!"
+                    self._log_pick(side, "swap", stolen, discarded=disc, score=best_ss)
+                    self.end_turn()
+                    return
+            self.current_turn = other
+            return
+
+        # Standard steal vs retain
+        best_ss, best_si = 0, -1
+        for i, ci in enumerate(opp_hand):
+            s = self._card_score(ci)
+            if s > best_ss:
+                best_ss, best_si = s, i
+
+        best_rs, best_ri = 0, -1
+        for i, ci in enumerate(hand):
+            s = self._card_score(ci)
+            if s > best_rs:
+                best_rs, best_ri = s, i
+
+        if best_ss > best_rs * 1.1 and best_si >= 0 and opp_hand:
+            ci = opp_hand.pop(best_si)
+            deck.append(ci)
+            self.action_message = f"{who} stole {CARD_POOL[ci]['name']}!"
+            self._log_pick(side, "steal", ci, score=best_ss)
+        elif best_ri >= 0 and hand:
+            ci = hand.pop(best_ri)
+            deck.append(ci)
+            self.action_message = f"{who} retained {CARD_POOL[ci]['name']}"
+            self._log_pick(side, "retain", ci, score=best_rs)
+
+        self.end_turn()
+
+    def check_phase_complete(self):
+        if len(self.player_deck) >= 3 and len(self.cpu_deck) >= 3:
+            self.phase_complete = True
+            if self.solver is not None:
+                self.solver.flush()
+            self.action_message = "Stealing Phase Complete! Press SPACE to begin battle!"
+
+    # ═══════════════════════════════════════
+    # CARD CREATION
+    # ═══════════════════════════════════════
+    def create_card_from_pool(self, idx, owner, slot):
+        data = CARD_POOL[idx]
+        return Card(
+            owner=owner, name=data["name"], hp=data["hp"], max_hp=data["hp"],
+            attacks=POOL_ATTACKS[idx], move_range=data.get("move", 3),
+            element=data["element"], index=slot
+        )
+
+    def get_final_decks(self):
+        player_cards = [self.create_card_from_pool(idx, "player", i) for i, idx in enumerate(self.player_deck)]
+        cpu_cards = [self.create_card_from_pool(idx, "enemy", i) for i, idx in enumerate(self.cpu_deck)]
+        return player_cards, cpu_cards
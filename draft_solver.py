@@ -0,0 +1,192 @@
+"""
+Draft solver — exact minimax over the stealing phase (headless).
+
+The draft is a small finite game: 10 dealt cards, players alternate, and
+each pick either RETAINs a card from the picker's own hand or STEALs one
+from the opponent's, until both decks hold 3. That is at most
+10·9·8·7·6·5 lines, so the solver searches the whole remaining tree.
+
+- State: (side to move, player hand, cpu hand, player deck, cpu deck) as
+  frozensets of CARD_POOL indices (order inside a hand never matters).
+- Value: sum of the CPU deck's card strengths minus the player's, with
+  strengths learned from simulation (card_strength.json, written by
+  simulate.py --card-strength). The CPU maximizes, the player minimizes.
+- Memo: every solved state is kept in memory; states within two picks of
+  a state the CPU actually asked about also go to an on-disk cache
+  (DRAFT_CACHE_FILE, written by flush() once a draft is over). That
+  covers the CPU's next question whatever the player picks in between,
+  so replayed drafts answer from disk. The cache is keyed on a
+  fingerprint of the strength table and dropped when the table changes.
+  It is plain JSON (hands and decks as sorted index lists), so loading a
+  cache file never runs code.
+"""
+import hashlib
+import json
+import os
+
+from config import DRAFT_CACHE_FILE
+
+DECK_SIZE = 3
+STRENGTH_FILE = os.path.join(os.path.dirname(__file__), "card_strength.json")
+PERSIST_PLIES = 2       # picks below an asked state that go to the disk cache
+MEMO_MAX = 500000       # in-memory states before the memo is reset
+DISK_CACHE_MAX = 100000 # states kept on disk (oldest dropped first)
+
+
+def fallback_strength(data):
+    """Strength from the card's stats alone (HP + attack damage, scaled)."""
+    return (data["hp"] + sum(a["damage"] for a in data.get("attacks", []))) / 100
+
+
+def load_strengths(pool, path=STRENGTH_FILE):
+    """Per-pool-index strength; cards the file does not know use their stats."""
+    learned = {}
+    if path and os.path.exists(path):
+        with open(path) as f:
+            learned = json.load(f)
+    return [learned.get(data["name"], fallback_strength(data)) for data in pool]
+
+
+def _encode(state, result):
+    """Disk cache entry: [turn, 4 sorted index lists, value, pick or None]."""
+    turn, *sets = state
+    value, pick = result
+    return [turn, *(sorted(s) for s in sets), value, pick and list(pick)]
+
+
+def _decode(entry):
+    """(state, result) from a disk cache entry; ValueError if malformed."""
+    turn, p_hand, c_hand, p_deck, c_deck, value, pick = entry
+    if turn not in ("player", "cpu") or not isinstance(value, (int, float)):
+        raise ValueError("bad draft cache entry")
+    state = (turn, *(frozenset(int(i) for i in s) for s in (p_hand, c_hand, p_deck, c_deck)))
+    if pick is not None:
+        action, card = pick
+        if action not in ("retain", "steal"):
+            raise ValueError("bad draft cache entry")
+        pick = (action, int(card))
+    return state, (value, pick)
+
+
+class DraftSolver:
+    def __init__(self, pool, strengths=None, cache_file=DRAFT_CACHE_FILE):
+        if cache_file and not os.path.isabs(cache_file):
+            cache_file = os.path.join(os.path.dirname(__file__), cache_file)
+        self.strength = strengths if strengths is not None else load_strengths(pool)
+        self.fingerprint = hashlib.sha1(
+            json.dumps([round(s, 6) for s in self.strength]).encode()
+        ).hexdigest()
+        self.cache_file = cache_file
+        self.memo = {}          # state -> (value for the CPU, best pick)
+        self._disk = {}
+        self._dirty = False
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file) as f:
+                    data = json.load(f)
+                if data["fingerprint"] == self.fingerprint:
+                    self._disk = dict(_decode(entry) for entry in data["states"])
+            except (OSError, ValueError, TypeError, KeyError):
+                pass    # unreadable cache: start afresh, it is rewritten below
+        self.memo.update(self._disk)
+
+    # ------------------------------
+    # SEARCH
+    # ------------------------------
+    def solve(self, state):
+        """(value for the CPU, best pick) with pick = ("retain"|"steal", card)."""
+        hit = self.memo.get(state)
+        if hit is not None:
+            return hit
+        if len(self.memo) >= MEMO_MAX:
+            self.memo = dict(self._disk)
+        turn, p_hand, c_hand, p_deck, c_deck = state
+        if len(p_deck) >= DECK_SIZE and len(c_deck) >= DECK_SIZE:
+            strength = self.strength
+            result = (sum(strength[i] for i in c_deck) - sum(strength[i] for i in p_deck), None)
+            self.memo[state] = result
+            return result
+
+        nxt = "cpu" if turn == "player" else "player"
+        if turn == "player":
+            hand, opp_hand, deck = p_hand, c_hand, p_deck
+        else:
+            hand, opp_hand, deck = c_hand, p_hand, c_deck
+
+        if len(deck) >= DECK_SIZE:
+            # full deck: nothing to pick, the turn passes
+            result = (self.solve((nxt, p_hand, c_hand, p_deck, c_deck))[0], None)
+            self.memo[state] = result
+            return result
+
+        best = None
+        for action, source in (("retain", hand), ("steal", opp_hand)):
+            for card in sorted(source):
+                new_deck = deck | {card}
+                if action == "retain":
+                    new_hand, new_opp = hand - {card}, opp_hand
+                else:
+                    new_hand, new_opp = hand, opp_hand - {card}
+                if turn == "player":
+                    child = (nxt, new_hand, new_opp, new_deck, c_deck)
+                else:
+                    child = (nxt, new_opp, new_hand, p_deck, new_deck)
+                value = self.solve(child)[0]
+                if best is None or (value > best[0] if turn == "cpu" else value < best[0]):
+                    best = (value, (action, card))
+        self.memo[state] = best
+        return best
+
+    def best_pick(self, turn, p_hand, c_hand, p_deck, c_deck):
+        """The solved pick for this draft position (kept for the disk cache)."""
+        state = (turn, frozenset(p_hand), frozenset(c_hand), frozenset(p_deck), frozenset(c_deck))
+        result = self.solve(state)
+        if state not in self._disk:
+            self._persist(state)
+        return result
+
+    # ------------------------------
+    # DISK CACHE
+    # ------------------------------
+    def _persist(self, root):
+        """Keep the solved states within PERSIST_PLIES picks of root."""
+        layer = [root]
+        for _ in range(PERSIST_PLIES + 1):
+            nxt = []
+            for state in layer:
+                if state in self._disk or state not in self.memo:
+                    continue
+                self._disk[state] = self.memo[state]
+                self._dirty = True
+                nxt.extend(self._children(state))
+            layer = nxt
+        if len(self._disk) > DISK_CACHE_MAX:
+            drop = len(self._disk) - DISK_CACHE_MAX
+            for state in list(self._disk)[:drop]:
+                del self._disk[state]
+
+    def flush(self):
+        """Write the disk cache if anything was added since the last flush."""
+        if not (self.cache_file and self._dirty):
+            return
+        self._dirty = False
+        tmp = f"{self.cache_file}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"fingerprint": self.fingerprint,
+                       "states": [_encode(s, r) for s, r in self._disk.items()]},
+                      f, separators=(",", ":"))
+        os.replace(tmp, self.cache_file)
+
+    @staticmethod
+    def _children(state):
+        turn, p_hand, c_hand, p_deck, c_deck = state
+        nxt = "cpu" if turn == "player" else "player"
+        if turn == "player":
+            if len(p_deck) >= DECK_SIZE:
+                return [(nxt, p_hand, c_hand, p_deck, c_deck)]
+            return ([(nxt, p_hand - {c}, c_hand, p_deck | {c}, c_deck) for c in p_hand]
+                    + [(nxt, p_hand, c_hand - {c}, p_deck | {c}, c_deck) for c in c_hand])
+        if len(c_deck) >= DECK_SIZE:
+            return [(nxt, p_hand, c_hand, p_deck, c_deck)]
+        return ([(nxt, p_hand, c_hand - {c}, p_deck, c_deck | {c}) for c in c_hand]
+                + [(nxt, p_hand - {c}, c_hand, p_deck, c_deck | {c}) for c in p_hand])
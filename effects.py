@@ -1,91 +1,300 @@
-import pygame
-from config import FPS
-from colors import E_FIRE, E_LEAF
-from game_grid import cell_center
-from animations import anim_mgr
+import heapq
+
+from events import emit, listening
+
+FLAME_DMG = 5           # per tick to enemies of the flame's owner
 
 # ==================================================
-# GLOBAL EFFECT LISTS
+# PER-BOARD EFFECT STORE (grid.effects)
 # ==================================================
-# flame_tiles: [col, row, time_left, owner]
-flame_tiles = []
+class EffectState:
+    """
+    Persistent effects, indexed for O(1) insert / lookup / removal:
+    - flames: (col, row) -> (expires, owner)    one flame per tile
+    - regen:  id -> (card, heal_per_tick, expires)
+    - burn:   id -> (card, dmg_per_tick, expires)
+    - by_card: card -> ids of its regen / burn effects
 
-# regen_effects: [card, heal_per_tick, time_left, (col,row)]
-regen_effects = []
+    Times are absolute logical ticks (`tick`, see advance()), so entries
+    never change once added; `left(expires)` is the ticks still to run.
+    Expiry times also go on min-heaps (flames, card effects), and each
+    tick pops only what is due instead of scanning every effect. Dicts keep insertion order, so
+    effects still resolve in the order they were cast.
+    """
 
-# burn_effects: [card, dmg_per_tick, time_left, (col,row)]
-burn_effects = []
+    def __init__(self):
+        self.tick = 0
+        self.flames = {}
+        self.regen = {}
+        self.burn = {}
+        self.by_card = {}
+        self._flame_expiry = [] # heap of (expires, id, tile)
+        self._expiry = []       # heap of (expires, id) for regen / burn
+        self._next_id = 0
 
+    def __bool__(self):
+        return bool(self.flames or self.regen or self.burn)
 
-# ==================================================
-# 🔥 FIRE TRAIL DAMAGE (CAN KILL)
-# ==================================================
-def process_flame_tiles(grid):
-    for ft in flame_tiles[:]:
-        c, r, t, owner = ft
-        t -= 1
-        ft[2] = t
+    def left(self, expires):
+        """Ticks an effect still runs for."""
+        return expires - self.tick
 
-        # remove expired fire
-        if t <= 0:
-            flame_tiles.remove(ft)
-            continue
+    # ------------------------------
+    # INSERT / LOOKUP / REMOVE
+    # ------------------------------
+    def _new_id(self):
+        eid = self._next_id
+        self._next_id += 1
+        return eid
 
-        if not grid.in_bounds(c, r):
-            continue
+    def flame_at(self, c, r):
+        """(expires, owner) of the flame on (c, r), or None."""
+        return self.flames.get((c, r))
 
-        card = grid.tiles[c][r].card
+    def add_flame(self, c, r, duration, owner):
+        """Light (c, r) unless it is already burning."""
+        if (c, r) in self.flames:
+            return False
+        expires = self.tick + duration
+        self.flames[(c, r)] = (expires, owner)
+        heapq.heappush(self._flame_expiry, (expires, self._new_id(), (c, r)))
+        return True
 
-        # ❗ damage ONLY enemies of owner
-        if card and card.owner != owner:
-            card.hp -= 5
-            anim_mgr.add_floating_text("-5🔥", *cell_center(c, r), E_FIRE)
+    def _add_card_effect(self, table, card, amount, duration):
+        expires = self.tick + duration
+        eid = self._new_id()
+        heapq.heappush(self._expiry, (expires, eid))
+        table[eid] = (card, amount, expires)
+        self.by_card[card] = self.by_card.get(card, ()) + (eid,)
+        return eid
+
+    def add_regen(self, card, heal, duration):
+        return self._add_card_effect(self.regen, card, heal, duration)
+
+    def add_burn(self, card, dmg, duration):
+        return self._add_card_effect(self.burn, card, dmg, duration)
+
+    def on_card(self, card):
+        """Regen / burn entries still pending on card."""
+        out = []
+        for eid in self.by_card.get(card, ()):
+            eff = self.regen.get(eid) or self.burn.get(eid)
+            if eff:
+                out.append(eff)
+        return out
+
+    def remove(self, eid):
+        """Drop a regen / burn effect (its heap entry lapses on its own)."""
+        eff = self.regen.pop(eid, None) or self.burn.pop(eid, None)
+        if eff is None:
+            return
+        card = eff[0]
+        ids = tuple(i for i in self.by_card[card] if i != eid)
+        if ids:
+            self.by_card[card] = ids
+        else:
+            del self.by_card[card]
 
-            if card.hp <= 0:
-                grid.tiles[c][r].card = None
+    def drop_card(self, card):
+        """Drop every regen / burn effect on card (it left the board)."""
+        for eid in self.by_card.get(card, ()):
+            self.regen.pop(eid, None)
+            self.burn.pop(eid, None)
+        self.by_card.pop(card, None)
+
+    def expire_flames(self):
+        """Put out the flames due by the current tick."""
+        heap, now = self._flame_expiry, self.tick
+        while heap and heap[0][0] <= now:
+            expires, _, tile = heapq.heappop(heap)
+            flame = self.flames.get(tile)
+            if flame is not None and flame[0] == expires:
+                del self.flames[tile]
+
+    def expire(self):
+        """Drop the regen / burn effects due by the current tick."""
+        heap, now = self._expiry, self.tick
+        while heap and heap[0][0] <= now:
+            self.remove(heapq.heappop(heap)[1])
+
+    # ------------------------------
+    # COPIES (snapshot / restore / clone)
+    # ------------------------------
+    def copy(self, cards=None):
+        """
+        Independent store; `cards` maps cards to replacements (Grid.clone).
+        Entries are immutable, so copying the containers is enough.
+        """
+        twin = EffectState.__new__(EffectState)
+        twin.load(self)
+        if cards:
+            remap = lambda table: {eid: (cards.get(e[0], e[0]),) + e[1:] for eid, e in table.items()}
+            twin.regen = remap(self.regen)
+            twin.burn = remap(self.burn)
+            twin.by_card = {cards.get(card, card): ids for card, ids in self.by_card.items()}
+        return twin
+
+    def load(self, other):
+        """Become a copy of other (in place, so grid.effects stays the same object)."""
+        self.tick = other.tick
+        self.flames = dict(other.flames)
+        self.regen = dict(other.regen)
+        self.burn = dict(other.burn)
+        self.by_card = dict(other.by_card)
+        self._flame_expiry = other._flame_expiry[:]
+        self._expiry = other._expiry[:]
+        self._next_id = other._next_id
 
 
 # ==================================================
-# 🌿 HEAL OVER TIME (LIMITED BY healed_once FLAG)
+# 🔥🌿 ONE TICK: FLAMES, REGEN, BURN — PER CARD
 # ==================================================
-def process_regen():
-    for eff in regen_effects[:]:
-        card, heal, t, pos = eff
-        t -= 1
-        eff[2] = t
+def tick_loads(grid):
+    """
+    card -> [pos, flame dmg, heal, burn dmg] this tick, summed over every
+    effect on it. Effects of cards no longer on the board are dropped.
+    Flames only hurt enemies of whoever lit them.
+    """
+    fx = grid.effects
+    tiles = grid.tiles
+    loads = {}
+    for (c, r), (_, owner) in fx.flames.items():
+        card = tiles[c][r].card
+        if card and card.owner != owner:
+            loads[card] = [(c, r), FLAME_DMG, 0, 0]
+    for card in list(fx.by_card):
+        load = loads.get(card)
+        if load is None:
+            pos = grid.find_card(card)
+            if pos is None:
+                fx.drop_card(card)      # died (or left) since the cast
+                continue
+            load = loads[card] = [pos, 0, 0, 0]
+        for eid in fx.by_card[card]:
+            eff = fx.regen.get(eid)
+            if eff:
+                load[2] += eff[1]
+            else:
+                load[3] += fx.burn[eid][1]
+    return loads
 
-        # card might already be dead
-        if card.hp <= 0:
-            regen_effects.remove(eff)
-            continue
 
-        # partial heal only
-        card.hp = min(card.max_hp, card.hp + heal)
-        anim_mgr.add_floating_text("+HEAL", *cell_center(*pos), E_LEAF)
+def resolve_tick(hp, max_hp, flame, heal, burn):
+    """
+    HP after one tick: flame damage first (it can kill before any heal),
+    then heal capped at max_hp, then burn. <= 0 means the unit died.
+    """
+    hp -= flame
+    if hp <= 0:
+        return hp
+    return min(max_hp, hp + heal) - burn
 
-        if t <= 0:
-            regen_effects.remove(eff)
+
+def process_effects(grid):
+    """
+    One tick of every persistent effect. Flames that are due go out before
+    they burn; regen / burn get their last tick on the tick they expire.
+    Each unit's flame, regen and burn are applied in one step and reported
+    in one "effects" event; a unit that dies loses its remaining effects.
+    """
+    fx = grid.effects
+    fx.tick += 1
+    if not fx:
+        return
+    fx.expire_flames()
+    loud = listening()
+    for card, (pos, flame, heal, burn) in tick_loads(grid).items():
+        old = card.hp
+        hp = resolve_tick(old, card.max_hp, flame, heal, burn)
+        if hp > old:
+            grid.heal_card(*pos, hp - old)
+        elif hp < old:
+            grid.damage_card(*pos, old - hp)
+        if hp <= 0:
+            fx.drop_card(card)
+        if loud:
+            # HP the regen actually restored: capped at max HP, none if the flame killed
+            singed = old - flame
+            gained = min(card.max_hp, singed + heal) - singed if singed > 0 else 0
+            emit("effects", pos=pos, card=card, dmg=flame + burn, heal=gained)
+    fx.expire()
 
 
 # ==================================================
-# 🔥 BURN DAMAGE (CAN KILL)
+# ⏩ FIXED TICK CLOCK
 # ==================================================
-def process_burn(grid):
-    for eff in burn_effects[:]:
-        card, dmg, t, pos = eff
-        t -= 1
-        eff[2] = t
+def advance(grid, n=1):
+    """
+    Run n logical ticks. Nobody listening for events (headless games,
+    muted search) lets quiet stretches go in one step: while no effect
+    expires, no unit dies and no heal hits max HP, every tick changes each
+    unit's HP by the same amount. Only the ticks with such an event are
+    run one by one, so the result is exactly that of n process_effects.
+    """
+    fx = grid.effects
+    end = fx.tick + n
+    fast = not listening()
+    while fx.tick < end:
+        if not fx:
+            fx.tick = end
+            return
+        if not (fast and _skip_quiet(grid, end - fx.tick)):
+            process_effects(grid)
+
+
+def _skip_quiet(grid, n):
+    """Fast-forward up to n quiet ticks; False if the next tick is not quiet."""
+    fx = grid.effects
+    now = fx.tick
+    loads = tick_loads(grid)
+
+    # flames go out at the start of their tick, card effects after theirs
+    if fx._flame_expiry:
+        n = min(n, fx._flame_expiry[0][0] - 1 - now)
+    if fx._expiry:
+        n = min(n, fx._expiry[0][0] - now)
 
-        # card might already be dead
-        if card.hp <= 0:
-            burn_effects.remove(eff)
-            continue
+    runs = []
+    for card, (pos, f, heal, burn) in loads.items():
+        quiet, capped = _quiet_run(card.hp, card.max_hp, f, heal, burn)
+        if quiet is not None:
+            n = min(n, quiet)
+        runs.append((pos, card, heal - f - burn, capped))
+    if n <= 0:
+        return False
 
-        card.hp -= dmg
-        anim_mgr.add_floating_text(f"-{dmg}", *cell_center(*pos), E_FIRE)
+    for pos, card, gain, capped in runs:
+        hp = capped if capped is not None else card.hp + n * gain
+        if hp > card.hp:
+            grid.heal_card(*pos, hp - card.hp)
+        elif hp < card.hp:
+            grid.damage_card(*pos, card.hp - hp)
+    fx.tick += n
+    fx.expire()
+    return True
 
-        if card.hp <= 0:
-            grid.tiles[pos[0]][pos[1]].card = None
 
-        if t <= 0:
-            burn_effects.remove(eff)
+def _quiet_run(hp, max_hp, f, heal, burn):
+    """
+    (ticks the unit can run quietly or None for no limit, HP after any of
+    them when capped at max HP or None when it moves by heal - f - burn).
+    A tick is resolve_tick(hp, max_hp, f, heal, burn).
+    """
+    gain = heal - f - burn
+    if hp - f + heal >= max_hp:
+        # capped: lands on max_hp - burn, and stays there if gain >= 0
+        top = max_hp - burn
+        if hp - f <= 0 or top <= 0:
+            return 0, None
+        if gain >= 0 and top - f > 0:
+            return None, top
+        return 1, top
+    if hp - f <= 0 or hp + gain <= 0:
+        return 0, None
+    if gain > 0:
+        # until the heal reaches max_hp
+        return -(-(max_hp + f - heal - hp) // gain), None
+    if gain == 0:
+        return None, None
+    # until a tick would kill: hp <= max(f, -gain) at its start
+    return -(-(hp - max(f, -gain)) // -gain), None
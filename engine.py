@@ -0,0 +1,210 @@
+"""
+Headless rules engine — no pygame anywhere in its import graph.
+
+Game wraps one board (grid state + its persistent effects) and exposes the
+rules as plain method calls: placement, movement, attack resolution,
+effect ticking and CPU turns. The GUI drives it from input and animation
+callbacks and listens on events for anything it should show; simulations
+and tests drive it directly.
+"""
+import random
+
+from config import GRID_COLS, GRID_ROWS, CPU_LEVELS, TICK_RATE
+from game_grid import Grid
+from effects import advance
+from logic_attack import perform_attack_logic
+from logic_cpu.advanced_cpu import advanced_cpu_turn, apply_cpu_action
+from logic_cpu.alphabeta_cpu import AlphaBetaCPU
+from logic_cpu.mcts_cpu import MctsCPU
+from logic_cpu.turn_planner import TurnPlanner
+
+# CPU controllers: callables  cpu(grid, side) -> action | None. A controller
+# with plan_turn(grid, side) -> [action, ...] opts into multi-action turns.
+CPU_KINDS = ("greedy", "alphabeta", "mcts", "planner")
+
+MAX_CATCHUP_S = 0.25    # update(): real time beyond this per call is dropped
+
+
+def cpu_kind(cpu):
+    """Controller kind of a kind or difficulty level name."""
+    return CPU_LEVELS[cpu]["cpu"] if cpu in CPU_LEVELS else cpu
+
+
+def make_cpu(cpu="greedy", seed=None, **settings):
+    """
+    Build a controller from a kind ("greedy", or "alphabeta" / "mcts" /
+    "planner" plus its settings) or from a difficulty level name in
+    config.CPU_LEVELS (settings override the level's). `seed` seeds the
+    controllers that roll dice of their own (MCTS).
+    """
+    if cpu in CPU_LEVELS:
+        return make_cpu(seed=seed, **dict(CPU_LEVELS[cpu], **settings))
+    if cpu == "greedy":
+        return advanced_cpu_turn
+    if cpu == "alphabeta":
+        return AlphaBetaCPU(**settings)
+    if cpu == "mcts":
+        return MctsCPU(seed=seed, **settings)
+    if cpu == "planner":
+        return TurnPlanner(**settings)
+    raise ValueError(f"unknown CPU: {cpu!r}")
+
+
+def decide_turn(cpu, grid, side):
+    """
+    The actions cpu plays this turn, in order: a planner's whole plan, or
+    the single action of any other controller ([] = pass).
+    """
+    plan_turn = getattr(cpu, "plan_turn", None)
+    if plan_turn is not None:
+        return plan_turn(grid, side)
+    action = cpu(grid, side)
+    return [action] if action else []
+
+
+def check_win_lose(grid):
+    if not grid.unit_count("enemy"):
+        return "victory"
+    if not grid.unit_count("player"):
+        return "defeat"
+    return "playing"
+
+
+class Game:
+    def __init__(self, cols=GRID_COLS, rows=GRID_ROWS, seed=None, cpu="greedy"):
+        # One RNG per game: the same seed replays the same game exactly
+        # (draft, placement, damage rolls). Cosmetic effects use their own
+        # stream (animations.fx_rng) so rendering never perturbs it.
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.grid = Grid(cols, rows)
+        self._tick_debt = 0.0   # real time not yet turned into effect ticks
+        # Who decides for each side when asked for a CPU action: the spec
+        # (kind or level name, controller seed, settings) and the controller
+        # built from it
+        self.cpu_spec = {}
+        self.cpu = {}
+        self.set_cpu("player", "greedy")
+        self.set_cpu("enemy", cpu)
+
+    # ------------------------------
+    # PLACEMENT / MOVEMENT
+    # ------------------------------
+    def place(self, card, pos):
+        if self.grid.tiles[pos[0]][pos[1]].card is not None:
+            return False
+        self.grid.place_card(pos[0], pos[1], card)
+        return True
+
+    def can_move(self, old_pos, new_pos):
+        return self.grid.movegen.can_move(old_pos, new_pos)
+
+    def move(self, old_pos, new_pos):
+        if not self.can_move(old_pos, new_pos):
+            return False
+        self.grid.move_card(old_pos, new_pos)
+        return True
+
+    # ------------------------------
+    # COMBAT
+    # ------------------------------
+    def in_attack_range(self, attacker_pos, target_pos, atk):
+        return self.grid.movegen.can_attack(attacker_pos, target_pos, atk)
+
+    def attack(self, attacker_pos, target_pos, atk):
+        perform_attack_logic(
+            attacker_pos[0], attacker_pos[1],
+            target_pos[0], target_pos[1],
+            atk, self.grid, self.rng
+        )
+
+    def tick(self):
+        """Advance persistent effects (fire trails, regen, burn) by one tick."""
+        advance(self.grid, 1)
+
+    def advance(self, ticks):
+        """Fast-forward persistent effects by `ticks` logical ticks."""
+        advance(self.grid, ticks)
+
+    def update(self, dt):
+        """
+        Run the effect ticks due after `dt` seconds of real time (the GUI
+        calls this once per frame), so rules speed never depends on FPS.
+        """
+        self._tick_debt += min(dt, MAX_CATCHUP_S) * TICK_RATE
+        ticks = int(self._tick_debt)
+        if ticks:
+            self._tick_debt -= ticks
+            advance(self.grid, ticks)
+
+    # ------------------------------
+    # CPU
+    # ------------------------------
+    def cpu_seed(self, side):
+        """Seed of side's controller, derived from the game seed (not drawn from rng)."""
+        return None if self.seed is None else self.seed * 2 + (side == "enemy")
+
+    def set_cpu(self, side, spec, **settings):
+        self.close_cpu(side)
+        seed = self.cpu_seed(side)
+        self.cpu_spec[side] = (spec, seed, tuple(sorted(settings.items())))
+        self.cpu[side] = make_cpu(spec, seed=seed, **settings)
+
+    def close_cpu(self, side=None):
+        """Release controllers' resources (MCTS worker pools); None = both sides."""
+        for s in ([side] if side else list(self.cpu)):
+            close = getattr(self.cpu.get(s), "close", None)
+            if close:
+                close()
+
+    def cpu_action(self, side="enemy"):
+        """Pick (but do not apply) the CPU's action for this turn."""
+        return self.cpu[side](self.grid, side)
+
+    def cpu_turn(self, side="enemy"):
+        """Pick (but do not apply) the CPU's actions for this turn (decide_turn)."""
+        return decide_turn(self.cpu[side], self.grid, side)
+
+    def is_legal(self, action, side=None):
+        """Would the rules allow this action dict on the current board?"""
+        return self.grid.movegen.is_legal(action, side)
+
+    def is_playable(self, action, side=None):
+        """Legal, and an attack still has a unit to affect (ActionGen.is_playable)."""
+        return self.grid.movegen.is_playable(action, side)
+
+    def apply(self, action):
+        apply_cpu_action(self.grid, action, self.rng)
+
+    def apply_turn(self, actions, side=None):
+        """
+        Apply a turn's queued actions in order. A step that earlier real
+        rolls made pointless or illegal (its unit or target died, its tile
+        got taken) is skipped. Returns the actions applied.
+        """
+        applied = []
+        for action in actions:
+            if self.is_playable(action, side):
+                self.apply(action)
+                applied.append(action)
+        return applied
+
+    def place_randomly(self, cards):
+        """Drop cards on random empty tiles (CPU placement)."""
+        grid = self.grid
+        empties = [
+            (x, y)
+            for x in range(grid.cols)
+            for y in range(grid.rows)
+            if not grid.tiles[x][y].card
+        ]
+        for card in cards:
+            if empties:
+                pos = self.rng.choice(empties)
+                self.place(card, pos)
+                empties.remove(pos)
+
+    def status(self):
+        return check_win_lose(self.grid)
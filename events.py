@@ -0,0 +1,55 @@
+"""
+Engine -> GUI event channel.
+
+Rules code never touches pygame: it emits events here, and whoever is
+listening (the GUI's AnimationManager) turns them into visuals.
+Headless runs simply have no listeners.
+
+Event kinds:
+- "text": pos=(c, r), text=str, color=(r, g, b) — floating combat text
+- "flash": card=Card, frames=int, heal=bool — hit/heal flash on a card
+- "effects": pos=(c, r), card=Card, dmg=int, heal=int — one tick of
+  persistent effects (flame + burn damage, regen) on one unit, summed;
+  heal is the HP actually gained (capped at max HP)
+Positions are tile coordinates, never pixels.
+
+AI search replays rules on scratch positions inside `with muted():`, which
+silences events for the calling thread only.
+"""
+import threading
+from contextlib import contextmanager
+
+_listeners = []
+_local = threading.local()
+
+
+def subscribe(fn):
+    """fn(kind, data) is called for every emitted event."""
+    if fn not in _listeners:
+        _listeners.append(fn)
+
+
+def unsubscribe(fn):
+    if fn in _listeners:
+        _listeners.remove(fn)
+
+
+@contextmanager
+def muted():
+    _local.muted = getattr(_local, "muted", 0) + 1
+    try:
+        yield
+    finally:
+        _local.muted -= 1
+
+
+def listening():
+    """Would an event emitted on this thread reach anyone?"""
+    return bool(_listeners) and not getattr(_local, "muted", 0)
+
+
+def emit(kind, **data):
+    if getattr(_local, "muted", 0):
+        return
+    for fn in _listeners:
+        fn(kind, data)
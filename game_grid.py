@@ -3,56 +3,247 @@ Grid is treated as an implicit unweighted graph:
 - Each tile is a node
 - Adjacent tiles are edges
 - BFS is used for movement and attack range evaluation
+  (see pathfinding.py for the occupancy-aware queries)
+
+Alongside the Tile objects the grid keeps an array-backed view of the board,
+indexed by  i = c * rows + r :
+- owner_masks: owner -> int bitboard (bit i set = unit of that owner on i)
+- hp:          array of current HP per tile (0 = empty)
+- elem:        element code per tile (ELEMENT_CODES)
+plus a unit index:
+- unit_pos:    (owner, card.index) -> (c, r)
+- units:       owner -> set of card indices on the board
+All of these are only ever written by the Grid mutators below.
+grid.movegen (movegen.ActionGen) derives the legal actions from them.
 """
 
+import copy
+from array import array
+
 from card import Tile
 from config import TILE_SIZE
+from effects import EffectState
+from geometry import get_geometry
+from movegen import ActionGen
+from pathfinding import IGNORE_UNITS, UNREACHABLE, distance_map
+
+ELEMENT_CODES = {"null": 0, "fire": 1, "water": 2, "leaf": 3, "wind": 4, "air": 4, "combined": 5}
+
+
+def iter_bits(mask):
+    """Yield the set bit indices of a bitboard, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
 
 class Grid:
     def __init__(self, cols, rows):
         self.cols = cols
         self.rows = rows
         self.tiles = [[Tile(c, r) for r in range(rows)] for c in range(cols)]
+        self.geo = get_geometry(cols, rows)   # shared distance / range tables
+        self.effects = EffectState()          # flame tiles, regen, burn
+
+        # Occupancy version: bumped whenever a card is placed, moves or dies.
+        # Anything derived from occupancy (reachability) is keyed on it.
+        self.version = 0
+        self._reach_cache = {}
+        self._reach_version = 0
+        self._diamonds = {}     # IGNORE_UNITS reach: (origin, depth) only
+
+        # Array-backed board view
+        self.owner_masks = {}
+        self.hp = array("h", [0]) * (cols * rows)
+        self.elem = bytearray(cols * rows)
+
+        # Unit index
+        self.unit_pos = {}
+        self.units = {}
+
+        # Legal moves / attack targets per unit, updated incrementally
+        self.movegen = ActionGen(self)
     
     def in_bounds(self, c, r):
         return 0 <= c < self.cols and 0 <= r < self.rows
 
-def cell_center(c, r):
-    return c * TILE_SIZE + TILE_SIZE // 2, r * TILE_SIZE + TILE_SIZE // 2
+    # ------------------------------
+    # MUTATORS (keep caches in sync)
+    # ------------------------------
+    def _set_bit(self, c, r, card):
+        i = c * self.rows + r
+        self.owner_masks[card.owner] = self.owner_masks.get(card.owner, 0) | (1 << i)
+        self.hp[i] = card.hp
+        self.elem[i] = ELEMENT_CODES.get(card.element, 0)
+        self.unit_pos[(card.owner, card.index)] = (c, r)
+        self.units.setdefault(card.owner, set()).add(card.index)
+
+    def _clear_bit(self, c, r, card):
+        i = c * self.rows + r
+        self.owner_masks[card.owner] &= ~(1 << i)
+        self.hp[i] = 0
+        self.elem[i] = 0
+        if self.unit_pos.get((card.owner, card.index)) == (c, r):
+            del self.unit_pos[(card.owner, card.index)]
+            self.units[card.owner].discard(card.index)
+
+    def place_card(self, c, r, card):
+        old = self.tiles[c][r].card
+        if old:
+            self._clear_bit(c, r, old)
+        self.tiles[c][r].card = card
+        self._set_bit(c, r, card)
+        self.version += 1
+
+    def remove_card(self, c, r):
+        card = self.tiles[c][r].card
+        if card:
+            self.tiles[c][r].card = None
+            self._clear_bit(c, r, card)
+            self.version += 1
+        return card
+
+    def move_card(self, old_pos, new_pos):
+        card = self.remove_card(*old_pos)
+        if card:
+            self.place_card(new_pos[0], new_pos[1], card)
+        return card
 
-def get_neighbors(c, r, grid):
-    """
-    Graph adjacency: returns neighboring nodes (up, down, left, right)
-    """
-    neighbors = []
-    for dc, dr in [(1,0), (-1,0), (0,1), (0,-1)]:
-        nc, nr = c + dc, r + dr
-        if grid.in_bounds(nc, nr):
-            neighbors.append((nc, nr))
-    return neighbors
-
-from collections import deque
-
-def bfs_reachable(start, max_depth, grid):
-    """
-    Graph traversal (BFS) to find all reachable nodes within max_depth
-    Manhattan steps from start. Uses visited set to avoid revisiting.
-    """
-    visited = {start}
-    queue = deque([(start, 0)])
-    reachable = set()
-
-    while queue:
-        (c, r), d = queue.popleft()
-        if d > max_depth:
-            continue
-
-        reachable.add((c, r))
-
-        for nc, nr in get_neighbors(c, r, grid):
-            if (nc, nr) not in visited:
-                visited.add((nc, nr))
-                queue.append(((nc, nr), d + 1))
-
-    return reachable
+    def damage_card(self, c, r, amount):
+        """Apply damage to the card on (c, r). Returns True if it died."""
+        card = self.tiles[c][r].card
+        card.hp -= amount
+        if card.hp <= 0:
+            self.remove_card(c, r)
+            return True
+        self.hp[c * self.rows + r] = card.hp
+        return False
 
+    def heal_card(self, c, r, amount):
+        """Heal the card on (c, r) up to max_hp. Returns HP actually gained."""
+        card = self.tiles[c][r].card
+        old = card.hp
+        card.hp = min(card.max_hp, card.hp + amount)
+        self.hp[c * self.rows + r] = card.hp
+        return card.hp - old
+
+    # ------------------------------
+    # BOARD QUERIES (index + bitboard view)
+    # ------------------------------
+    def unit_count(self, owner):
+        return len(self.units.get(owner, ()))
+
+    def find_unit(self, owner, index):
+        """(c, r) of owner's unit with that card index, or None. O(1)."""
+        return self.unit_pos.get((owner, index))
+
+    def positions(self, owner):
+        """(c, r) of every unit of owner, in column-major scan order."""
+        rows = self.rows
+        return [divmod(i, rows) for i in iter_bits(self.owner_masks.get(owner, 0))]
+
+    def find_card(self, card):
+        """Current (c, r) of a card, or None if it is no longer on the board."""
+        pos = self.unit_pos.get((card.owner, card.index))
+        if pos and self.tiles[pos[0]][pos[1]].card is card:
+            return pos
+        return None
+
+    def units_in_range(self, owner, pos, k):
+        """Positions of owner's units within Manhattan distance k of pos."""
+        rows = self.rows
+        mask = self.owner_masks.get(owner, 0) & self.geo.range_mask(pos, k)
+        return [divmod(i, rows) for i in iter_bits(mask)]
+
+    # ------------------------------
+    # SNAPSHOT / RESTORE (search)
+    # ------------------------------
+    def snapshot(self):
+        """
+        Everything the rules can change: unit placement, per-card rule state
+        (hp, shield, healed_once) and the effect store. Restore with restore().
+        """
+        tiles = self.tiles
+        units = []
+        for (c, r) in self.unit_pos.values():
+            card = tiles[c][r].card
+            units.append(((c, r), card, card.hp, card.shield, card.healed_once))
+        return units, self.effects.copy()
+
+    def clone(self):
+        """
+        Independent board with copies of every card (effects re-pointed at
+        the copies), for thinking on another thread while this one lives on.
+        """
+        twin = Grid(self.cols, self.rows)
+        copies = {}
+        tiles = self.tiles
+        for (c, r) in self.unit_pos.values():
+            card = tiles[c][r].card
+            copies[card] = copy.copy(card)
+            twin.place_card(c, r, copies[card])
+        twin.effects.load(self.effects.copy(copies))
+        return twin
+
+    def restore(self, snap):
+        units, effects = snap
+        for pos in list(self.unit_pos.values()):
+            self.remove_card(*pos)
+        for (c, r), card, hp, shield, healed_once in units:
+            card.hp = hp
+            card.shield = shield
+            card.healed_once = healed_once
+            self.place_card(c, r, card)
+        self.effects.load(effects)
+
+    # ------------------------------
+    # PICKLING (cpu_worker ships clones to its process)
+    # ------------------------------
+    def __getstate__(self):
+        """Board state only: geometry and caches are rebuilt on load."""
+        state = self.__dict__.copy()
+        for name in ("geo", "_reach_cache", "_reach_version", "_diamonds", "movegen"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.geo = get_geometry(self.cols, self.rows)   # the process's shared tables
+        self._reach_cache = {}
+        self._reach_version = self.version
+        self._diamonds = {}
+        self.movegen = ActionGen(self)
+
+    # ------------------------------
+    # REACHABILITY CACHE
+    # ------------------------------
+    def reachable(self, start, max_depth, block=IGNORE_UNITS, owner=None):
+        """
+        Cached pathfinding query keyed on (origin, depth, blocking rule,
+        occupancy version). The whole cache is dropped as soon as the
+        version moves on. Units are transparent under IGNORE_UNITS, so
+        those sets (the range diamond) are kept for good.
+        """
+        if block == IGNORE_UNITS:
+            key = (start, max_depth)
+            reach = self._diamonds.get(key)
+            if reach is None:
+                reach = self._diamonds[key] = frozenset(self.geo.within(start, max_depth))
+            return reach
+
+        if self._reach_version != self.version:
+            self._reach_cache.clear()
+            self._reach_version = self.version
+
+        key = (start, max_depth, block, owner)
+        reach = self._reach_cache.get(key)
+        if reach is None:
+            dist = distance_map(self, [start], max_depth, block, owner)
+            coords = self.geo.coords
+            reach = frozenset(coords[i] for i, d in enumerate(dist) if d != UNREACHABLE)
+            self._reach_cache[key] = reach
+        return reach
+
+def cell_center(c, r):
+    return c * TILE_SIZE + TILE_SIZE // 2, r * TILE_SIZE + TILE_SIZE // 2
@@ -0,0 +1,88 @@
+"""
+Precomputed board geometry, shared by every Grid of the same size.
+
+Tiles are addressed by  i = c * rows + r  (same order as grid.tiles, the
+pathfinding distance maps and the grid bitboards). Built once per
+(cols, rows) via get_geometry(); rows of the distance table and the range
+masks are filled lazily and kept for the rest of the process.
+"""
+from functools import lru_cache
+
+
+class BoardGeometry:
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.size = cols * rows
+        self.coords = [(c, r) for c in range(cols) for r in range(rows)]
+        self.edge = [c in (0, cols - 1) or r in (0, rows - 1) for (c, r) in self.coords]
+        # in-bounds neighbour indices of each tile: right, left, down, up
+        self.neighbors = [
+            tuple(nc * rows + nr for nc, nr in ((c + 1, r), (c - 1, r), (c, r + 1), (c, r - 1))
+                  if 0 <= nc < cols and 0 <= nr < rows)
+            for (c, r) in self.coords
+        ]
+
+        self._dist_rows = [None] * self.size
+        self._within = {}
+        self._masks = {}
+
+    def index(self, c, r):
+        return c * self.rows + r
+
+    # ------------------------------
+    # DISTANCE TABLE
+    # ------------------------------
+    def dist_row(self, pos):
+        """Manhattan distance from pos to every tile, as a flat list."""
+        i = pos[0] * self.rows + pos[1]
+        row = self._dist_rows[i]
+        if row is None:
+            pc, pr = pos
+            col_d = [abs(c - pc) for c in range(self.cols)]
+            row_d = [abs(r - pr) for r in range(self.rows)]
+            row = [dc + dr for dc in col_d for dr in row_d]
+            self._dist_rows[i] = row
+        return row
+
+    def distance(self, a, b):
+        return self.dist_row(a)[b[0] * self.rows + b[1]]
+
+    # ------------------------------
+    # RANGE (DIAMOND) TABLES
+    # ------------------------------
+    def within(self, pos, k):
+        """Every in-bounds (c, r) within Manhattan distance k of pos."""
+        key = (pos, k)
+        tiles = self._within.get(key)
+        if tiles is None:
+            pc, pr = pos
+            tiles = []
+            for c in range(max(0, pc - k), min(self.cols, pc + k + 1)):
+                span = k - abs(c - pc)
+                for r in range(max(0, pr - span), min(self.rows, pr + span + 1)):
+                    tiles.append((c, r))
+            tiles = tuple(tiles)
+            self._within[key] = tiles
+        return tiles
+
+    def range_mask(self, pos, k):
+        """Bitboard of every tile within Manhattan distance k of pos."""
+        key = (pos, k)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = 0
+            pc, pr = pos
+            for c in range(max(0, pc - k), min(self.cols, pc + k + 1)):
+                span = k - abs(c - pc)
+                lo = max(0, pr - span)
+                hi = min(self.rows - 1, pr + span)
+                # rows lo..hi of column c are contiguous bits
+                mask |= ((1 << (hi - lo + 1)) - 1) << (c * self.rows + lo)
+            self._masks[key] = mask
+        return mask
+
+
+@lru_cache(maxsize=None)
+def get_geometry(cols, rows):
+    return BoardGeometry(cols, rows)
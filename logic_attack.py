@@ -1,9 +1,29 @@
-import random
-from config import GRID_COLS, GRID_ROWS, FPS
-from game_grid import cell_center
-from effects import flame_tiles, regen_effects, burn_effects
-from colors import E_FIRE, E_LEAF
-from animations import anim_mgr
+"""
+Attack resolution rules (headless).
+
+Resolving is split in two:
+- resolve_attack() works out what an attack would do and returns it as a
+  list of deltas. It reads the board but never changes it (it does draw
+  the damage roll from rng), so search can weigh an attack without
+  copying or undoing anything.
+- apply_outcome() carries deltas out on the board and emits their events
+  (events.emit) for the GUI. perform_attack_logic() is the two in a row.
+
+Deltas are tuples, in the order the rules produce them:
+    ("hp", (c, r), card, amount)      damage (< 0, may kill) or heal (> 0,
+                                      already capped at max_hp)
+    ("death", (c, r), card)           follows the lethal "hp" delta
+    ("shield", card, amount)          shield change (absorbed hits < 0)
+    ("healed_once", card)
+    ("flame", (c, r), duration, owner)
+    ("regen", card, heal_per_tick, duration)
+    ("burn", card, dmg_per_tick, duration)
+    ("text", (c, r), text, color)     floating text
+    ("flash", card, frames, heal)     hit / heal flash
+"""
+from config import TICK_RATE
+from colors import C_WHITE, E_FIRE, E_LEAF
+from events import emit
 
 RARITY_MULT = {
     "normal": 1.0,
@@ -12,208 +32,194 @@ RARITY_MULT = {
     "legendary": 1.5
 }
 
+# ==================================================
+# BEHAVIOUR REGISTRY
+# ==================================================
+# Attack.behavior (cards.json "behavior", resolved once by make_attack)
+# -> resolver(grid, rng, atk, attacker, target, ac, ar, tc, tr, dist, out),
+# which appends its deltas to out. New special attacks register a
+# resolver here instead of growing perform_attack_logic.
+BEHAVIORS = {}
 
-def perform_attack_logic(ac, ar, tc, tr, atk, grid, dist=0):
+
+def behavior(name):
+    def register(fn):
+        BEHAVIORS[name] = fn
+        return fn
+    return register
+
+
+def is_heal_attack(atk):
+    return atk.behavior == "heal"
+
+
+def resolve_attack(ac, ar, tc, tr, atk, grid, rng):
+    """
+    Deltas of one attack from (ac, ar) on (tc, tr), board untouched.
+    `rng` is the game's random.Random — the only source of randomness in
+    combat (search passes a stand-in that rolls the mean).
+    """
+    out = []
     # ------------------------------
     # RANGE SAFETY CHECK
     # ------------------------------
-    dist = abs(ac - tc) + abs(ar - tr)
+    dist = grid.geo.distance((ac, ar), (tc, tr))
     if dist > atk.attack_range:
-        return
+        return out
 
     attacker = grid.tiles[ac][ar].card
     target = grid.tiles[tc][tr].card
     if not attacker:
-        return
+        return out
+
+    BEHAVIORS[atk.behavior](grid, rng, atk, attacker, target, ac, ar, tc, tr, dist, out)
+    return out
+
+
+def apply_outcome(grid, deltas):
+    """Carry out resolve_attack's deltas on the board, emitting their events."""
+    fx = grid.effects
+    for d in deltas:
+        kind = d[0]
+        if kind == "hp":
+            _, (c, r), _, amount = d
+            if amount < 0:
+                grid.damage_card(c, r, -amount)
+            else:
+                grid.heal_card(c, r, amount)
+        elif kind == "text":
+            emit("text", pos=d[1], text=d[2], color=d[3])
+        elif kind == "flash":
+            emit("flash", card=d[1], frames=d[2], heal=d[3])
+        elif kind == "shield":
+            d[1].shield += d[2]
+        elif kind == "healed_once":
+            d[1].healed_once = True
+        elif kind == "flame":
+            fx.add_flame(*d[1], d[2], d[3])
+        elif kind == "regen":
+            fx.add_regen(d[1], d[2], d[3])
+        elif kind == "burn":
+            fx.add_burn(d[1], d[2], d[3])
+        # "death": the lethal "hp" delta already took the unit off the board
+
+
+def perform_attack_logic(ac, ar, tc, tr, atk, grid, rng):
+    """Resolve one attack from (ac, ar) on (tc, tr) and apply it."""
+    apply_outcome(grid, resolve_attack(ac, ar, tc, tr, atk, grid, rng))
+
+
+def _damage(out, pos, card, dmg):
+    out.append(("hp", pos, card, -dmg))
+    if card.hp <= dmg:
+        out.append(("death", pos, card))
+
+
+def healed(deltas):
+    """Total HP an outcome heals."""
+    return sum(d[3] for d in deltas if d[0] == "hp" and d[3] > 0)
+
+
+# =====================================================
+# 1. Fire trail (FIRE) — NO FRIENDLY DAMAGE
+# =====================================================
+@behavior("fire_trail")
+def fire_trail(grid, rng, atk, attacker, target, ac, ar, tc, tr, dist, out):
+    dx = 1 if tc > ac else -1
+    fx = grid.effects
+
+    for i in range(1, 6):
+        nc = ac + dx * i
+        if grid.in_bounds(nc, ar) and not fx.flame_at(nc, ar):
+            out.append(("flame", (nc, ar), TICK_RATE * 3, attacker.owner))
+
+    out.append(("text", (ac, ar), "🔥 FIRE TRAIL", E_FIRE))
+
+    # upfront hit only if opponent: half the range-reduced damage,
+    # capped at a quarter of the target's max HP
+    if target and target.owner != attacker.owner:
+        base_dmg = max(1, min(atk.dmg - dist, int(target.max_hp * 0.25)))
+        dmg = max(1, int(base_dmg * 0.5))
+        out.append(("flash", target, 10, False))
+        out.append(("text", (tc, tr), f"-{dmg}", E_FIRE))
+        _damage(out, (tc, tr), target, dmg)
 
-    # ------------------------------
-    # DAMAGE BASE CALCULATION
-    # ------------------------------
-    dmg_reduction = dist
-    base_dmg = atk.dmg - dmg_reduction
-
-    if target:
-        MAX_HIT_DAMAGE = int(target.max_hp * 0.25)
-        base_dmg = max(1, min(base_dmg, MAX_HIT_DAMAGE))
-
-    # =====================================================
-    # 1. Burning Trail (FIRE) — NO FRIENDLY DAMAGE
-    # =====================================================
-    if atk.name == "Burning Trail":
-        dx = 1 if tc > ac else -1
-
-        for i in range(1, 6):
-            nc = ac + dx * i
-            if grid.in_bounds(nc, ar):
-                if not any(ft[0] == nc and ft[1] == ar for ft in flame_tiles):
-                    flame_tiles.append([nc, ar, FPS * 3, attacker.owner])
-
-        anim_mgr.add_floating_text("🔥 FIRE TRAIL", *cell_center(ac, ar), E_FIRE)
-
-        # upfront hit only if opponent
-        if target and target.owner != attacker.owner:
-            dmg = max(1, int(base_dmg * 0.5))
-            target.hp -= dmg
-            target.flash_timer = 10
-            anim_mgr.add_floating_text(f"-{dmg}", *cell_center(tc, tr), E_FIRE)
-
-            if target.hp <= 0:
-                grid.tiles[tc][tr].card = None
-        return
-
-    # =====================================================
-    # 2. Nature’s Embrace (LEAF) — HEAL ONCE ONLY
-    # =====================================================
-    if atk.name == "Nature's Embrace":
-        plus = [(tc,tr),(tc+1,tr),(tc-1,tr),(tc,tr+1),(tc,tr-1)]
-
-        for (x, y) in plus:
-            if grid.in_bounds(x,y) and grid.tiles[x][y].card:
-                c = grid.tiles[x][y].card
 
-                # 🟢 HEAL TEAM ONLY (ONCE)
-                if c.owner == attacker.owner and not c.healed_once:
-                    regen_effects.append([c, 5, FPS * 2, (x,y)])
-                    c.healed_once = True
-                    anim_mgr.add_floating_text("+HEAL", *cell_center(x,y), E_LEAF)
+# =====================================================
+# 2. Auras (LEAF / FUSION) — regen allies ONCE, burn enemies
+# =====================================================
+PLUS = ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1))
+RING = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1), (1, -1), (-1, 1))
 
-                # 🔴 DAMAGE ENEMY ONLY
-                elif c.owner != attacker.owner:
-                    burn_effects.append([c, 8, FPS * 2, (x,y)])
-                    anim_mgr.add_floating_text("-THORN", *cell_center(x,y), E_FIRE)
-
-        return
-
-    # =====================================================
-    # 2b. Generic Heal attacks - RESTORE HP
-    # =====================================================
-    is_heal = ("heal" in atk.name.lower()) or ("heal" in getattr(atk, 'animation', '').lower())
-    if is_heal:
-        heal_amount = atk.dmg
-        healed_any = False
-
-        # Heal ALL allies on the board (except the attacker)
-        for gx in range(grid.cols):
-            for gy in range(grid.rows):
-                ally = grid.tiles[gx][gy].card
-                if ally and ally.owner == attacker.owner and ally is not attacker:
-                    ally_old = ally.hp
-                    ally.hp = min(ally.max_hp, ally.hp + heal_amount)
-                    ally_gained = ally.hp - ally_old
-                    if ally_gained > 0:
-                        ally.heal_flash_timer = 15
-                        anim_mgr.add_floating_text(f"+{ally_gained} HP", *cell_center(gx, gy), E_LEAF)
-                        healed_any = True
-
-        if healed_any:
-            anim_mgr.add_floating_text("HEAL!", *cell_center(ac, ar), E_LEAF)
-        else:
-            anim_mgr.add_floating_text("ALLIES FULL", *cell_center(ac, ar), E_LEAF)
-        return
-
-    # =====================================================
-    # 3. Burning–Embrace Fusion — TEAM SAFE
-    # =====================================================
-    if atk.name == "Burning-Embrace Fusion":
-        around = [
-            (tc+1,tr),(tc-1,tr),(tc,tr+1),(tc,tr-1),
-            (tc+1,tr+1),(tc-1,tr-1),(tc+1,tr-1),(tc-1,tr+1)
-        ]
-
-        for (x,y) in around:
+
+def aura(shape, heal, burn, heal_text, burn_text):
+    """Resolver: regen for allies not healed yet, burn for enemies, on shape around the target."""
+    def resolve(grid, rng, atk, attacker, target, ac, ar, tc, tr, dist, out):
+        for dx, dy in shape:
+            x, y = tc + dx, tr + dy
             if grid.in_bounds(x,y) and grid.tiles[x][y].card:
                 c = grid.tiles[x][y].card
 
-                # 🟢 HEAL TEAM ONCE
+                # 🟢 HEAL TEAM ONLY (ONCE)
                 if c.owner == attacker.owner and not c.healed_once:
-                    regen_effects.append([c, 5, FPS * 2, (x,y)])
-                    c.healed_once = True
-                    anim_mgr.add_floating_text("+FUSION HEAL", *cell_center(x,y), E_LEAF)
+                    out.append(("regen", c, heal, TICK_RATE * 2))
+                    out.append(("healed_once", c))
+                    out.append(("text", (x,y), heal_text, E_LEAF))
 
                 # 🔴 DAMAGE ENEMY ONLY
                 elif c.owner != attacker.owner:
-                    burn_effects.append([c, 10, FPS * 2, (x,y)])
-                    anim_mgr.add_floating_text("-FUSION FIRE", *cell_center(x,y), E_FIRE)
-
-        return
-
-    # =====================================================
-    # 4. Normal Attack — NO FRIENDLY FIRE
-    # =====================================================
+                    out.append(("burn", c, burn, TICK_RATE * 2))
+                    out.append(("text", (x,y), burn_text, E_FIRE))
+    return resolve
+
+
+BEHAVIORS["embrace"] = aura(PLUS, 5, 8, "+HEAL", "-THORN")
+BEHAVIORS["fusion_embrace"] = aura(RING, 5, 10, "+FUSION HEAL", "-FUSION FIRE")
+
+
+# =====================================================
+# 3. Heal — RESTORE HP of every ally
+# =====================================================
+@behavior("heal")
+def heal_allies(grid, rng, atk, attacker, target, ac, ar, tc, tr, dist, out):
+    heal_amount = atk.dmg
+    healed_any = False
+
+    # Heal ALL allies on the board (except the attacker)
+    for gx, gy in grid.positions(attacker.owner):
+        ally = grid.tiles[gx][gy].card
+        if ally is not attacker:
+            ally_gained = min(ally.max_hp, ally.hp + heal_amount) - ally.hp
+            if ally_gained > 0:
+                out.append(("hp", (gx, gy), ally, ally_gained))
+                out.append(("flash", ally, 15, True))
+                out.append(("text", (gx, gy), f"+{ally_gained} HP", E_LEAF))
+                healed_any = True
+
+    if healed_any:
+        out.append(("text", (ac, ar), "HEAL!", E_LEAF))
+    else:
+        out.append(("text", (ac, ar), "ALLIES FULL", E_LEAF))
+
+
+# =====================================================
+# 4. Normal Attack — NO FRIENDLY FIRE
+# =====================================================
+@behavior("strike")
+def strike(grid, rng, atk, attacker, target, ac, ar, tc, tr, dist, out):
     if target and target.owner != attacker.owner:
-        base = atk.dmg + random.randint(-2, 2)
+        base = atk.dmg + rng.randint(-2, 2)
         mult = RARITY_MULT.get(attacker.rarity, 1.0)
         dmg = int(base * mult)
 
         if target.shield > 0:
             absorbed = min(target.shield, dmg)
-            target.shield -= absorbed
             dmg -= absorbed
-            anim_mgr.add_floating_text(f"-{absorbed}🛡", *cell_center(tc,tr))
+            out.append(("shield", target, -absorbed))
+            out.append(("text", (tc,tr), f"-{absorbed}🛡", C_WHITE))
+
+        out.append(("flash", target, 8, False))
 
         if dmg > 0:
-            target.hp -= dmg
-            anim_mgr.add_floating_text(f"-{dmg}", *cell_center(tc,tr))
-
-        target.flash_timer = 8
-
-        if target.hp <= 0:
-            grid.tiles[tc][tr].card = None
-
-
-def initiate_player_attack(player_idx, attack_idx, enemy_idx, grid):
-    if anim_mgr.blocking:
-        return None
-
-    pc_pos = None
-    ec_pos = None
-
-    for c in range(GRID_COLS):
-        for r in range(GRID_ROWS):
-            card = grid.tiles[c][r].card
-            if card:
-                if card.owner == "player" and card.index == player_idx:
-                    pc_pos = (c,r)
-                elif card.owner == "enemy" and card.index == enemy_idx:
-                    ec_pos = (c,r)
-
-    if not pc_pos or not ec_pos:
-        return False
-
-    attacker = grid.tiles[pc_pos[0]][pc_pos[1]].card
-    atk = attacker.attacks[attack_idx]
-
-    from game_grid import bfs_reachable
-    reachable = bfs_reachable(pc_pos, atk.attack_range, grid)
-
-    if ec_pos not in reachable:
-        anim_mgr.add_floating_text(
-            "OUT OF RANGE!",
-            *cell_center(*pc_pos),
-            (255,180,0)
-        )
-        return False
-
-    # Get animation type from attack
-    anim_type = getattr(atk, 'animation', None)
-    if anim_type is None:
-        # Fallback based on element
-        anim_type = f"projectile_{atk.element}" if atk.element != "null" else "beam_null"
-
-    # Heal attacks: animation targets self instead of enemy
-    is_heal_atk = ("heal" in atk.name.lower()) or ("heal" in (anim_type or '').lower())
-    anim_target = cell_center(*pc_pos) if is_heal_atk else cell_center(*ec_pos)
-
-    anim_mgr.trigger_attack_anim(
-        cell_center(*pc_pos),
-        anim_target,
-        atk.element,
-        lambda: perform_attack_logic(
-            pc_pos[0], pc_pos[1],
-            ec_pos[0], ec_pos[1],
-            atk, grid
-        ),
-        anim_type=anim_type
-    )
-
-    return True
+            out.append(("text", (tc,tr), f"-{dmg}", C_WHITE))
+            _damage(out, (tc, tr), target, dmg)
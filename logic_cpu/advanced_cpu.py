@@ -1,68 +1,92 @@
 """
 Advanced CPU Controller with Stealing Phase
 Flow: Timing -> Steal Eval -> Greedy Deck -> Combat D&C -> Execute
+
+Headless: advanced_cpu_turn() only decides, apply_cpu_action() applies the
+rules. The GUI animates in between (ui_actions.execute_cpu_action).
 """
-import random
-from game_grid import cell_center
-from animations import anim_mgr
+import decision_log
+from decision_log import DEBUG, INFO
 from logic_attack import perform_attack_logic
 
-from logic_cpu.dc_combat import select_attack_target, select_position, select_attack_placement
+from logic_cpu.dc_combat import group_targets, select_attack_target, select_position, select_attack_placement
 
 current_turn = 0
 
-def advanced_cpu_turn(grid):
+def _attack_option(card, pos, target_pos, grid):
+    """(attack, score) of attacking target_pos from pos, or (None, -1)."""
+    attack_obj = select_attack_placement(card, pos, target_pos, grid)
+    if not attack_obj:
+        return None, -1
+    attack_score = attack_obj.dmg
+    if attack_obj.element == "fire": attack_score += 2
+
+    # Bonus for killing blow
+    t_card = grid.tiles[target_pos[0]][target_pos[1]].card
+    if t_card and t_card.hp <= attack_obj.dmg:
+        attack_score += 50
+    return attack_obj, attack_score
+
+def advanced_cpu_turn(grid, side="enemy"):
+    """
+    Evaluate every unit of `side` and return the single best action (or None).
+    The GUI always plays "enemy"; the simulator also drives "player".
+
+    Stages: gather units -> group targets (once per turn) -> score targets
+    -> score positions -> pick an action. Each unit picks one target and
+    both its attack and its move are scored against it.
+    """
     global current_turn
     current_turn += 1
-    
-    if anim_mgr.blocking:
-        return
 
     # -----------------------------------------------------------------
     # PHASE 2: COMBAT PHASE (Strict Move OR Attack)
     # -----------------------------------------------------------------
-    
-    enemy_positions = []
-    curr_player_positions = []
-    
-    for c in range(grid.cols):
-        for r in range(grid.rows):
-            card = grid.tiles[c][r].card
-            if card:
-                if card.owner == "enemy":
-                    enemy_positions.append((c,r))
-                else:
-                    curr_player_positions.append((c,r))
-
-    # Evaluate best single action across all cards
-    best_action = None
-    best_score = -1
-    
-    print(f"--- CPU TURN START (Turn {current_turn}) ---")
-    print(f"CPU evaluating {len(enemy_positions)} units.")
+    debug = decision_log.enabled(DEBUG)
 
+    # --- STAGE 1: gather units ---
+    foe = "player" if side == "enemy" else "enemy"
+    enemy_positions = grid.positions(side)
+    curr_player_positions = grid.positions(foe)
+    units = []
     for e_pos in enemy_positions:
         e_card = grid.tiles[e_pos[0]][e_pos[1]].card
-        if not e_card: continue
+        if e_card:
+            units.append((e_pos, e_card))
 
-        # --- OPTION A: ATTACK (from current position) ---
-        target_pos = select_attack_target(e_card, e_pos, curr_player_positions, grid)
-        attack_obj = None
-        attack_score = -1
-        
+    if debug:
+        decision_log.log(DEBUG, "cpu_turn", turn=current_turn, side=side, units=len(enemy_positions))
+
+    # --- STAGE 2: group targets (same for every unit) ---
+    candidates = group_targets(curr_player_positions, grid)
+
+    # --- STAGE 3: score targets (one target + best attack per unit) ---
+    options = []
+    for e_pos, e_card in units:
+        target_pos = select_attack_target(e_card, e_pos, curr_player_positions, grid, candidates)
         if target_pos:
-            attack_obj = select_attack_placement(e_card, e_pos, target_pos, grid)
-            if attack_obj:
-                attack_score = attack_obj.dmg
-                if attack_obj.element == "fire": attack_score += 2
-                
-                # Bonus for killing blow
-                t_card = grid.tiles[target_pos[0]][target_pos[1]].card
-                if t_card and t_card.hp <= attack_obj.dmg:
-                    attack_score += 50
-        
-            print(f"[{current_turn}] Eval ATTACK {e_card.name}: Score={attack_score}")
-        
+            attack_obj, attack_score = _attack_option(e_card, e_pos, target_pos, grid)
+        else:
+            attack_obj, attack_score = None, -1
+        options.append([e_pos, e_card, target_pos, attack_obj, attack_score, None])
+
+    # --- STAGE 4: score positions (move toward the same target) ---
+    # Note: a move scores lower than a good attack unless nothing better
+    # is on offer.
+    for option in options:
+        e_pos, e_card, target_pos = option[:3]
+        option[5] = select_position(e_card, e_pos, target_pos, grid)
+
+    # --- STAGE 5: pick the single best action ---
+    best_action = None
+    best_score = -1
+    for e_pos, e_card, target_pos, attack_obj, attack_score, new_pos in options:
+        # --- OPTION A: ATTACK (from current position) ---
+        if debug and target_pos:
+            decision_log.log(DEBUG, "cpu_candidate", turn=current_turn, kind="attack",
+                             unit=e_card.name, pos=e_pos, target=target_pos,
+                             attack=attack_obj.name if attack_obj else None,
+                             score=attack_score, best=attack_score > best_score)
         if attack_score > best_score:
             best_score = attack_score
             best_action = {
@@ -72,20 +96,14 @@ def advanced_cpu_turn(grid):
                 'target': target_pos,
                 'attack': attack_obj
             }
-            print(f"[{current_turn}] New Best: ATTACK {e_card.name} (Score: {best_score})")
 
         # --- OPTION B: MOVE (no attack) ---
-        # Note: We calculate best move target, but score it lower than a good attack
-        # unless it sets up a kill or saves the unit.
-        move_target_pos = select_attack_target(e_card, e_pos, curr_player_positions, grid)
-        new_pos = select_position(e_card, e_pos, move_target_pos, grid)
-        
-        move_score = 0
-        if new_pos != e_pos:
-            move_score = 10 # Base score for moving
-            # Add heuristics here if needed (e.g. closer to weak enemy)
-        
-        print(f"[{current_turn}] Eval MOVE {e_card.name} to {new_pos}: Score={move_score}")
+        move_score = 10 if new_pos != e_pos else 0  # base score for moving
+
+        if debug:
+            decision_log.log(DEBUG, "cpu_candidate", turn=current_turn, kind="move",
+                             unit=e_card.name, pos=e_pos, to=new_pos,
+                             score=move_score, best=move_score > best_score)
 
         if move_score > best_score:
             best_score = move_score
@@ -95,49 +113,30 @@ def advanced_cpu_turn(grid):
                 'pos': e_pos, # Current pos
                 'new_pos': new_pos
             }
-            print(f"[{current_turn}] New Best: MOVE {e_card.name} (Score: {best_score})")
-
-    # Execute the SINGLE best action
-    if best_action:
-        print(f"--- EXECUTING BEST ACTION ---")
-        if best_action['type'] == 'MOVE':
-            card = best_action['card']
-            old_pos = best_action['pos']
-            new_pos = best_action['new_pos']
-            print(f"CPU Action: MOVE {card.name} from {old_pos} to {new_pos}")
-            
-            # Helper for move animation callback
-            def finalize_move(g=grid, old=old_pos, new=new_pos, c=card):
-                move_grid_card(g, old, new, c)
-                print(f"Move Complete: {c.name}")
-                
-            anim_mgr.trigger_move_anim(
-                cell_center(*old_pos),
-                cell_center(*new_pos),
-                finalize_move
-            )
-            anim_mgr.add_floating_text(f"Moving {card.name}", cell_center(*new_pos)[0], cell_center(*new_pos)[1] - 40, (255, 255, 255))
-            
-        elif best_action['type'] == 'ATTACK':
-            card = best_action['card']
-            pos = best_action['pos']
-            target = best_action['target']
-            attack = best_action['attack']
-            print(f"[{current_turn}] CPU Action: ATTACK {card.name} at {target} with {attack.name}")
-            
-            dist = abs(pos[0] - target[0]) + abs(pos[1] - target[1])
-            anim_mgr.trigger_attack_anim(
-                cell_center(*pos),
-                cell_center(*target),
-                attack.element,
-                lambda ep=pos, tp=target, atk=attack, g=grid, d=dist: perform_attack_logic(
-                    ep[0], ep[1], tp[0], tp[1], atk, g, d
-                )
-            )
-            anim_mgr.add_floating_text(f"Attacking!", cell_center(*pos)[0], cell_center(*pos)[1] - 40, (255, 50, 50))
-    else:
-        print("CPU found no valid actions.")
+
+    # Report the SINGLE best action
+    if decision_log.enabled(INFO):
+        if best_action is None:
+            decision_log.log(INFO, "cpu_action", turn=current_turn, side=side, type=None)
+        elif best_action['type'] == 'MOVE':
+            decision_log.log(INFO, "cpu_action", turn=current_turn, side=side, type="MOVE",
+                             unit=best_action['card'].name, pos=best_action['pos'],
+                             to=best_action['new_pos'], score=best_score)
+        else:
+            decision_log.log(INFO, "cpu_action", turn=current_turn, side=side, type="ATTACK",
+                             unit=best_action['card'].name, pos=best_action['pos'],
+                             target=best_action['target'], attack=best_action['attack'].name,
+                             score=best_score)
+    return best_action
+
+def apply_cpu_action(grid, action, rng):
+    """Apply a chosen action to the board (rules only, no animation)."""
+    if action['type'] == 'MOVE':
+        move_grid_card(grid, action['pos'], action['new_pos'], action['card'])
+    elif action['type'] == 'ATTACK':
+        pos, target = action['pos'], action['target']
+        perform_attack_logic(pos[0], pos[1], target[0], target[1], action['attack'], grid, rng)
 
 def move_grid_card(grid, old_pos, new_pos, card):
-    grid.tiles[new_pos[0]][new_pos[1]].card = card
-    grid.tiles[old_pos[0]][old_pos[1]].card = None
+    if grid.tiles[old_pos[0]][old_pos[1]].card is card:
+        grid.move_card(old_pos, new_pos)
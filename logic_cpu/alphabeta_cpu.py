@@ -0,0 +1,326 @@
+"""
+Alpha-beta search CPU (optional controller, headless).
+
+Negamax with alpha-beta pruning over single actions (one MOVE or one
+ATTACK per ply, sides alternating as in the game). The rules themselves
+are the model: each candidate is applied with apply_cpu_action on the
+board, scored, and undone with Grid.snapshot()/restore(), so there is no
+separate simulation of attacks or effects to keep in sync.
+
+- Damage rolls use their mean (ExpectedRoll), events are muted.
+- Persistent effects are not ticked inside the search; evaluate() counts
+  the HP still owed by pending burn / regen / flame tiles instead.
+- Move ordering: transposition-table move first, then attacks by the same
+  score advanced_cpu_turn uses, then moves — those that bring an enemy
+  into reach first, each group ranked by greedy_move's scores. Only the
+  best `moves_per_unit` moves of each unit are searched.
+- Positions are cached in a Zobrist-hashed transposition table that
+  persists across turns.
+
+Turns are anytime: think() deepens one ply at a time (1, 2, ...) until
+max_depth or a millisecond budget runs out, and returns the best action
+found so far. Each finished iteration seeds the next one's move order
+through the transposition table.
+
+Controllers are callables  cpu(grid, side) -> action | None  returning the
+same action dicts as advanced_cpu_turn, so Game.apply() takes either.
+"""
+from time import perf_counter
+
+import decision_log
+from card_features import offense_score
+from decision_log import INFO
+from effects import FLAME_DMG
+from events import muted
+from logic_attack import healed, resolve_attack
+from logic_cpu.advanced_cpu import apply_cpu_action
+from logic_cpu.greedy_move import move_scores
+from logic_cpu.zobrist import position_hash
+from movegen import other_side
+
+UNIT_VALUE = 100        # a living unit is worth this much on top of its HP
+THREAT_BONUS = 5        # per enemy the side to move can hit right away
+APPROACH = 1            # per tile the side to move is out of its own reach
+WIN_SCORE = 100000
+
+EXACT, LOWER, UPPER = 0, 1, 2
+TT_MAX_ENTRIES = 200000
+CLOCK_EVERY = 16        # nodes between deadline checks
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget is spent."""
+
+
+class ExpectedRoll:
+    """Stand-in rng for search: every roll lands on its mean."""
+    def randint(self, a, b):
+        return (a + b) // 2
+
+
+EXPECTED = ExpectedRoll()
+
+
+# ==================================================
+# EVALUATION
+# ==================================================
+def evaluate(grid, side):
+    """
+    Material from side's point of view (side is the one to move): for each
+    unit still standing once pending effects run out, UNIT_VALUE + effective
+    HP. Side's units also get a bonus per enemy they can hit right away —
+    only the side to move has that tempo, which keeps the search from
+    settling into standoffs just out of range.
+    """
+    tiles = grid.tiles
+    owed = {}
+    fx = grid.effects
+    for card, dmg, expires in fx.burn.values():
+        owed[card] = owed.get(card, 0) - dmg * fx.left(expires)
+    for card, heal, expires in fx.regen.values():
+        owed[card] = owed.get(card, 0) + heal * fx.left(expires)
+    for (c, r), (expires, owner) in fx.flames.items():
+        card = tiles[c][r].card
+        if card and card.owner != owner:
+            owed[card] = owed.get(card, 0) - FLAME_DMG * fx.left(expires)
+
+    foe = other_side(side)
+    rows = grid.rows
+    foe_rows = [grid.geo.dist_row(p) for p in grid.positions(foe)]
+    score = 0
+    for (owner, _), (c, r) in grid.unit_pos.items():
+        card = tiles[c][r].card
+        hp = min(card.max_hp, card.hp + owed.get(card, 0)) if owed else card.hp
+        if hp <= 0:
+            continue
+        if owner == side:
+            reach = card.features.reach
+            score += UNIT_VALUE + hp
+            in_reach = len(grid.units_in_range(foe, (c, r), reach))
+            if in_reach:
+                score += THREAT_BONUS * in_reach
+            elif foe_rows:
+                i = c * rows + r
+                score -= APPROACH * (min(row[i] for row in foe_rows) - reach)
+        else:
+            score -= UNIT_VALUE + hp
+    return score
+
+
+# ==================================================
+# ACTION GENERATION (ordered)
+# ==================================================
+def action_key(action):
+    if action['type'] == 'MOVE':
+        return ('M', action['pos'], action['new_pos'])
+    return ('A', action['pos'], action['target'], action['attack'].name)
+
+
+def attack_score(atk, target_card):
+    """advanced_cpu_turn's attack score: damage, fire bonus, kill bonus."""
+    score = offense_score(atk)
+    if target_card.hp <= atk.dmg:
+        score += 50
+    return score
+
+
+def unit_actions(grid, pos, foe_positions, moves_per_unit):
+    """
+    [(order score, key, action)] of the unit on pos, unsorted: its attacks
+    (heals only with something to heal) and its best `moves_per_unit` moves.
+    """
+    tiles = grid.tiles
+    gen = grid.movegen
+    card = tiles[pos[0]][pos[1]].card
+    side = card.owner
+    heals = card.features.heals
+    out = []
+
+    # --- attacks ---
+    for atk, tpos in gen.attacks(pos):
+        action = {'type': 'ATTACK', 'card': card, 'pos': pos,
+                  'target': tpos, 'attack': atk}
+        if atk in heals:
+            # heals every other ally (aimed at the caster's own tile)
+            missing = healed(resolve_attack(*pos, *tpos, atk, grid, EXPECTED))
+            if missing:
+                out.append((missing, action_key(action), action))
+            continue
+        out.append((attack_score(atk, tiles[tpos[0]][tpos[1]].card),
+                    action_key(action), action))
+
+    # --- moves: the best few, tiles that bring an enemy into reach
+    # first, then by greedy_move's score ---
+    targets = gen.moves(pos)
+    if targets and foe_positions:
+        reach = card.features.reach
+        foe_mask = grid.owner_masks.get(other_side(side), 0)
+        range_mask = grid.geo.range_mask
+        ranked = sorted(
+            (not foe_mask & range_mask(t, reach), score, i)
+            for i, (t, score) in enumerate(zip(targets, move_scores(targets, foe_positions, grid)))
+        )
+        for rank, (_, _, i) in enumerate(ranked[:moves_per_unit]):
+            action = {'type': 'MOVE', 'card': card, 'pos': pos, 'new_pos': targets[i]}
+            out.append((10 - rank, action_key(action), action))
+    return out
+
+
+class AlphaBetaCPU:
+    def __init__(self, max_depth=2, budget_ms=None, moves_per_unit=6):
+        self.max_depth = max_depth
+        self.budget_ms = budget_ms      # None = always finish max_depth
+        self.moves_per_unit = moves_per_unit
+        self.tt = {}            # hash -> (depth, value, flag, best action key)
+        self.nodes = 0
+        self.deadline = None
+        self._partial = None    # best (action, value) of the running iteration
+
+    def __call__(self, grid, side="enemy"):
+        return self.think(grid, side)
+
+    def ordered_actions(self, grid, side, first=None):
+        """
+        [(order score, key, action)], best-first; `first` is tried first.
+        Candidates are grid.movegen's legal actions, minus heals with
+        nothing to heal and all but each unit's best few moves.
+        """
+        foe_positions = grid.positions(other_side(side))
+        out = []
+        for pos in grid.positions(side):
+            out.extend(unit_actions(grid, pos, foe_positions, self.moves_per_unit))
+
+        out.sort(key=lambda t: t[0], reverse=True)
+        if first is not None:
+            for i, entry in enumerate(out):
+                if entry[1] == first:
+                    out.insert(0, out.pop(i))
+                    break
+        return out
+
+    # ==================================================
+    # SEARCH
+    # ==================================================
+    def _negamax(self, grid, side, depth, alpha, beta):
+        self.nodes += 1
+        if self.deadline is not None and not self.nodes % CLOCK_EVERY \
+                and perf_counter() > self.deadline:
+            raise SearchTimeout
+        foe = other_side(side)
+        if not grid.unit_count(side):
+            return -WIN_SCORE - depth      # lose as late as possible
+        if not grid.unit_count(foe):
+            return WIN_SCORE + depth       # win as early as possible
+        if depth == 0:
+            return evaluate(grid, side)
+
+        key = position_hash(grid, side)
+        entry = self.tt.get(key)
+        first = None
+        if entry is not None:
+            e_depth, e_value, e_flag, first = entry
+            if e_depth >= depth:
+                if e_flag == EXACT:
+                    return e_value
+                if e_flag == LOWER:
+                    alpha = max(alpha, e_value)
+                else:
+                    beta = min(beta, e_value)
+                if alpha >= beta:
+                    return e_value
+
+        actions = self.ordered_actions(grid, side, first)
+        if not actions:
+            return evaluate(grid, side)
+
+        alpha0 = alpha
+        best, best_key = -WIN_SCORE * 2, None
+        snap = grid.snapshot()
+        for _, akey, action in actions:
+            apply_cpu_action(grid, action, EXPECTED)
+            value = -self._negamax(grid, foe, depth - 1, -beta, -alpha)
+            grid.restore(snap)
+            if value > best:
+                best, best_key = value, akey
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        flag = UPPER if best <= alpha0 else LOWER if best >= beta else EXACT
+        if len(self.tt) >= TT_MAX_ENTRIES:
+            self.tt.clear()
+        self.tt[key] = (depth, best, flag, best_key)
+        return best
+
+    def _root(self, grid, side, depth):
+        """Best (action, value) at this depth, or (None, evaluation)."""
+        foe = other_side(side)
+        key = position_hash(grid, side)
+        entry = self.tt.get(key)
+        actions = self.ordered_actions(grid, side, entry[3] if entry else None)
+        if not actions:
+            return None, evaluate(grid, side)
+
+        alpha, beta = -WIN_SCORE * 2, WIN_SCORE * 2
+        best_action, best_key = None, None
+        self._partial = None
+        snap = grid.snapshot()
+        try:
+            for _, akey, action in actions:
+                apply_cpu_action(grid, action, EXPECTED)
+                value = -self._negamax(grid, foe, depth - 1, -beta, -alpha)
+                grid.restore(snap)
+                if best_action is None or value > alpha:
+                    alpha, best_action, best_key = value, action, akey
+                    self._partial = (action, value)
+                if self.deadline is not None and perf_counter() > self.deadline:
+                    raise SearchTimeout
+        except SearchTimeout:
+            # the search was cut off somewhere below: put the board back
+            grid.restore(snap)
+            raise
+        self.tt[key] = (depth, alpha, EXACT, best_key)
+        return best_action, alpha
+
+    def think(self, grid, side, budget_ms=None, max_depth=None):
+        """
+        Anytime decision. Iterative deepening up to max_depth within
+        budget_ms (defaults: the controller's own settings); returns the best
+        action of the deepest finished iteration, or of the unfinished one
+        if it already found something better — its first candidate is always
+        the previous iteration's best.
+        """
+        max_depth = max_depth or self.max_depth
+        budget_ms = self.budget_ms if budget_ms is None else budget_ms
+        start = perf_counter()
+        self.deadline = start + budget_ms / 1000 if budget_ms else None
+        self.nodes = 0
+
+        action, value, reached, finished = None, None, 0, True
+        with muted():
+            for depth in range(1, max_depth + 1):
+                try:
+                    found, found_value = self._root(grid, side, depth)
+                except SearchTimeout:
+                    finished = False
+                    if self._partial is not None:
+                        action, value = self._partial
+                    break
+                action, value, reached = found, found_value, depth
+                if found is None or abs(found_value) >= WIN_SCORE:
+                    break           # nothing to do, or the result is forced
+                if self.deadline is not None and perf_counter() >= self.deadline:
+                    break
+            if action is None and not finished:
+                # out of time before even one candidate was scored
+                ordered = self.ordered_actions(grid, side)
+                action = ordered[0][2] if ordered else None
+        self.deadline = None
+
+        if decision_log.enabled(INFO):
+            decision_log.log(INFO, "cpu_search", side=side, depth=reached, finished=finished,
+                             ms=round((perf_counter() - start) * 1000, 2), nodes=self.nodes,
+                             tt=len(self.tt), value=value,
+                             action=action_key(action) if action else None)
+        return action
@@ -4,31 +4,45 @@ D&C Combat Logic: Target, Position, Attack Selection
 from logic_cpu.greedy_target_weakest import greedy_best_target
 from logic_cpu.greedy_move import greedy_nearest_move
 
-def select_attack_target(attacker_card, attacker_pos, players, grid):
+def group_targets(players, grid):
     """
-    D&C #1 — Attack Target Selection
-    Divide targets by element group, conquer by finding weakest in each,
-    then delegate final pick to greedy scoring.
+    D&C #1a — Divide targets by element group, conquer by finding the
+    weakest in each. Independent of the attacker, so a CPU turn does it
+    once for all of its units. Falls back to all players. Reads only the
+    grid's flat elem / hp arrays, never the cards.
     """
-    # Divide: group player positions by element
+    rows = grid.rows
+    elem, hp = grid.elem, grid.hp
+
+    # Divide: group player positions by element code
     grouped = {}
     for p_pos in players:
-        card = grid.tiles[p_pos[0]][p_pos[1]].card
-        if not card:
+        i = p_pos[0] * rows + p_pos[1]
+        if not hp[i]:
             continue
-        elem = card.element
-        if elem not in grouped:
-            grouped[elem] = []
-        grouped[elem].append(p_pos)
+        code = elem[i]
+        if code not in grouped:
+            grouped[code] = []
+        grouped[code].append(p_pos)
 
     # Conquer: collect the weakest target from each element group
     priority_targets = []
-    for elem, positions in grouped.items():
-        weakest_pos = min(positions, key=lambda p: grid.tiles[p[0]][p[1]].card.hp)
+    for code, positions in grouped.items():
+        weakest_pos = min(positions, key=lambda p: hp[p[0] * rows + p[1]])
         priority_targets.append(weakest_pos)
 
     # If we have priority targets, let greedy pick among them; otherwise all
-    candidates = priority_targets if priority_targets else players
+    return priority_targets if priority_targets else players
+
+def select_attack_target(attacker_card, attacker_pos, players, grid, candidates=None):
+    """
+    D&C #1 — Attack Target Selection
+    Divide targets by element group, conquer by finding weakest in each,
+    then delegate final pick to greedy scoring. Pass `candidates` (from
+    group_targets) to reuse a grouping already done this turn.
+    """
+    if candidates is None:
+        candidates = group_targets(players, grid)
     return greedy_best_target(attacker_pos, candidates, grid)
 
 def select_position(attacker_card, attacker_pos, target_pos, grid):
@@ -44,24 +58,10 @@ def select_attack_placement(attacker_card, attacker_pos, target_pos, grid):
     """
     D&C #5 — Attack Placement / Zone Evaluation
     Skips heal attacks for CPU offense (heal is self-heal, not useful for attacking)
+    The best offensive attack per distance is precomputed in card.features.
     """
     if not target_pos: return None
-    
-    best_attack = None
-    max_score = -1
-    
-    dist = abs(attacker_pos[0] - target_pos[0]) + abs(attacker_pos[1] - target_pos[1])
-    
-    for atk in attacker_card.attacks:
-        # Skip heal attacks when picking offensive attack
-        is_heal = ("heal" in atk.name.lower()) or ("heal" in getattr(atk, 'animation', '').lower())
-        if is_heal:
-            continue
-        if dist <= atk.attack_range:
-            score = atk.dmg
-            if atk.element == "fire": score += 2
-            if score > max_score:
-                max_score = score
-                best_attack = atk
-                
-    return best_attack
+
+    best_at = attacker_card.features.best_at
+    dist = grid.geo.distance(attacker_pos, target_pos)
+    return best_at[dist] if dist < len(best_at) else None
@@ -1,44 +1,72 @@
-from game_grid import bfs_reachable
+from pathfinding import move_targets
+
+IDEAL_RANGE = 3  # optimal distance for your game (ranged-heavy)
+RANGE_ROWS_MAX = 4096
+SCORE_ROWS_MAX = 4096
+
+# Whole-board score rows, shared by every Grid of the same size:
+#   (geo, pos)      -> |distance to pos - IDEAL_RANGE| for every tile
+#   (geo, players)  -> sum of those rows over players + edge penalty
+_range_rows = {}
+_score_rows = {}
+
+
+def _range_row(geo, pos):
+    key = (geo, pos)
+    row = _range_rows.get(key)
+    if row is None:
+        if len(_range_rows) >= RANGE_ROWS_MAX:
+            _range_rows.clear()
+        row = _range_rows[key] = [abs(d - IDEAL_RANGE) for d in geo.dist_row(pos)]
+    return row
+
+
+def score_row(geo, players):
+    """
+    Greedy score of every tile against all players at once (flat list,
+    i = c * rows + r). Rows are summed column-wise by zip/map in one pass
+    and cached per player set, so scoring k candidates is k lookups.
+    """
+    players = tuple(players)
+    key = (geo, players)
+    row = _score_rows.get(key)
+    if row is None:
+        if len(_score_rows) >= SCORE_ROWS_MAX:
+            _score_rows.clear()
+        edge = [2 if e else 0 for e in geo.edge]
+        row = list(map(sum, zip(edge, *(_range_row(geo, p) for p in players))))
+        _score_rows[key] = row
+    return row
+
 
 # greedy_move.py  — Greedy Algorithm for position selection
+def move_scores(tiles, players, grid):
+    """
+    Greedy score of each (c, r) in tiles — total distance from the ideal
+    combat range to every player, plus an edge penalty. Lower is better.
+    """
+    rows = grid.rows
+    row = score_row(grid.geo, players)
+    return [row[c * rows + r] for (c, r) in tiles]
+
 def greedy_nearest_move(e_pos, players, grid, move_range):
     """
     Greedy nearest-move: BFS to find reachable tiles,
     then greedily pick the tile closest to ideal combat range.
     """
-    # BFS once to get all reachable cells within move_range
-    reachable = bfs_reachable(e_pos, move_range, grid)
-
-    # Filter to empty tiles only
-    possible_moves = [
-        (c, r) for (c, r) in reachable
-        if grid.tiles[c][r].card is None or (c, r) == e_pos
-    ]
+    # BFS once (enemies block the path) -> empty tiles in BFS order,
+    # plus staying put
+    possible_moves = [e_pos] + move_targets(grid, e_pos, move_range)
 
-    if not possible_moves:
+    # First tile with the lowest score (BFS order breaks ties)
+    scores = move_scores(possible_moves, players, grid)
+    best_score = min(scores)
+    if best_score >= 9999:
         return e_pos
-
-    best_move = e_pos
-    best_score = 9999
-
-    IDEAL_RANGE = 3  # optimal distance for your game (ranged-heavy)
-
-    for (c, r) in possible_moves:
-        total_score = 0
-        for (px, py) in players:
-            d = abs(px - c) + abs(py - r)
-            total_score += abs(d - IDEAL_RANGE)
-
-        edge_penalty = 2 if c in (0, grid.cols-1) or r in (0, grid.rows-1) else 0
-        score = total_score + edge_penalty
-
-        if score < best_score:
-            best_score = score
-            best_move = (c, r)
+    best_move = possible_moves[scores.index(best_score)]
 
     # Prevent useless movement
     if best_move == e_pos:
         return e_pos
 
     return best_move
-
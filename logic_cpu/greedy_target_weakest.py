@@ -8,6 +8,7 @@ def greedy_best_target(e_pos, players, grid):
 
     best_score = -9999
     best_target = None
+    dist_row = grid.geo.dist_row(e_pos)
 
     for (px, py) in players:
         card = grid.tiles[px][py].card
@@ -18,11 +19,11 @@ def greedy_best_target(e_pos, players, grid):
         hp_factor = 1 - (card.hp / card.max_hp)  # 0..1
 
         # 2️⃣ Prefer closer targets
-        dist = abs(e_pos[0] - px) + abs(e_pos[1] - py)
+        dist = dist_row[px * grid.rows + py]
         dist_factor = 1 / max(dist, 1)
 
         # 3️⃣ Prefer high-damage threats
-        threat = max((a.dmg for a in card.attacks), default=0)
+        threat = card.features.max_dmg
 
         score = (
             hp_factor * 10 +
@@ -0,0 +1,336 @@
+"""
+Monte Carlo Tree Search CPU (optional controller, headless).
+
+Unlike the alpha-beta search, MCTS plays the real dice: every playout
+walks the tree from the current board, applying actions with a live
+random.Random (so the ±2 damage roll varies) and ticking persistent
+effects (burn, regen, flame tiles) between actions, then finishes with a
+cheap rollout. The tree is open-loop — nodes are action sequences, not
+exact positions — so the same node naturally averages over roll and
+effect outcomes.
+
+- Tree policy: UCT over the candidates AlphaBetaCPU.ordered_actions
+  produces (expanded best-first).
+- Default policy: the greedy policies — attack the greedy_best_target in
+  reach with select_attack_placement's attack, otherwise step toward it
+  with greedy_nearest_move; a small epsilon picks a random unit to move.
+- Rollouts stop after `rollout_plies`; unfinished games are scored with
+  alphabeta_cpu.evaluate squashed to a win probability.
+- Budget: `playouts` and/or `budget_ms`, whichever runs out first.
+- `workers` > 1 adds root-parallel searches in forked processes on copies
+  of the board; their root statistics are merged into the local tree.
+  Only a top-level process on Linux forks them (not cpu_worker's child).
+- Tree reuse: the subtree under the chosen action is kept; next turn the
+  opponent's reply is identified among its children and that subtree
+  becomes the new root.
+"""
+import math
+import multiprocessing
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+import decision_log
+from config import TICK_RATE
+from decision_log import INFO
+from effects import advance
+from events import muted
+from logic_cpu.advanced_cpu import apply_cpu_action
+from logic_cpu.alphabeta_cpu import (
+    AlphaBetaCPU, EXPECTED, attack_score, evaluate, other_side,
+)
+from logic_cpu.dc_combat import select_attack_placement
+from logic_cpu.greedy_move import greedy_nearest_move
+from logic_cpu.greedy_target_weakest import greedy_best_target
+
+EVAL_SCALE = 100.0      # evaluate() points per logit of win probability
+EPSILON = 0.1           # chance a rollout ply makes a random greedy move
+
+
+class Node:
+    __slots__ = ("key", "action", "mover", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, key, action, mover, parent):
+        self.key = key
+        self.action = action
+        self.mover = mover          # side that played `action` to reach this node
+        self.parent = parent
+        self.children = {}
+        self.untried = None         # [(key, action)], filled on first visit
+        self.visits = 0
+        self.wins = 0.0             # from `mover`'s point of view
+
+
+def _valid(grid, action, side):
+    """Can `action` still be played here (open loop: the board may differ)?"""
+    c, r = action['pos']
+    card = grid.tiles[c][r].card
+    if card is not action['card'] or card.owner != side:
+        return False
+    if action['type'] == 'MOVE':
+        nc, nr = action['new_pos']
+        return grid.tiles[nc][nr].card is None
+    return True
+
+
+def _occupancy(grid):
+    """Which tiles each side holds, independent of dict order."""
+    return frozenset((owner, mask) for owner, mask in grid.owner_masks.items() if mask)
+
+
+def rollout_action(grid, side, rng):
+    """One ply of the greedy default policy."""
+    foe = other_side(side)
+    tiles = grid.tiles
+    mine = grid.positions(side)
+    best, best_score = None, -1
+    for pos in mine:
+        card = tiles[pos[0]][pos[1]].card
+        reach = card.features.reach
+        in_reach = grid.units_in_range(foe, pos, reach)
+        if not in_reach:
+            continue
+        target = greedy_best_target(pos, in_reach, grid)
+        atk = select_attack_placement(card, pos, target, grid)
+        if atk:
+            score = attack_score(atk, tiles[target[0]][target[1]].card)
+            if score > best_score:
+                best_score = score
+                best = {'type': 'ATTACK', 'card': card, 'pos': pos, 'target': target, 'attack': atk}
+    if best is not None and rng.random() >= EPSILON:
+        return best
+
+    foes = grid.positions(foe)
+    if not mine or not foes:
+        return best
+    pos = rng.choice(mine)
+    card = tiles[pos[0]][pos[1]].card
+    target = greedy_best_target(pos, foes, grid)
+    new_pos = greedy_nearest_move(pos, [target], grid, card.move_range)
+    if new_pos == pos:
+        return best
+    return {'type': 'MOVE', 'card': card, 'pos': pos, 'new_pos': new_pos}
+
+
+def _worker_search(grid, side, settings, seed):
+    """Root-parallel worker: search a private board, return root stats."""
+    cpu = MctsCPU(**dict(settings, workers=1, seed=seed))
+    with muted():
+        root, _ = cpu._search(grid, side, Node(None, None, other_side(side), None))
+    return {key: (child.visits, child.wins) for key, child in root.children.items()}
+
+
+class MctsCPU:
+    def __init__(self, playouts=2000, budget_ms=None, workers=1, rollout_plies=16,
+                 ticks_per_ply=TICK_RATE, exploration=1.4, moves_per_unit=4, seed=None):
+        self.playouts = playouts
+        self.budget_ms = budget_ms
+        self.workers = workers
+        self.rollout_plies = rollout_plies
+        self.ticks_per_ply = ticks_per_ply
+        self.exploration = exploration
+        self.moves_per_unit = moves_per_unit
+        self.rng = random.Random(seed)
+        self._gen = AlphaBetaCPU(moves_per_unit=moves_per_unit)   # candidate generator
+        self._pool = None
+        self._reuse = None      # (chosen child, board snapshot right after it)
+
+    def close(self):
+        """Shut down the worker pool (if one was started)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def settings(self):
+        return dict(playouts=self.playouts, budget_ms=self.budget_ms,
+                    rollout_plies=self.rollout_plies, ticks_per_ply=self.ticks_per_ply,
+                    exploration=self.exploration, moves_per_unit=self.moves_per_unit)
+
+    def __call__(self, grid, side="enemy"):
+        start = perf_counter()
+        with muted():
+            root = self._reused_root(grid, side) or Node(None, None, other_side(side), None)
+            reused = root.visits
+            futures = self._spawn_workers(grid, side)
+            root, playouts = self._search(grid, side, root)
+            for future in futures:
+                for key, (visits, wins) in future.result().items():
+                    child = root.children.get(key)
+                    if child is not None:
+                        child.visits += visits
+                        child.wins += wins
+                        playouts += visits
+
+        if not root.children:
+            self._reuse = None
+            return None
+        best = max(root.children.values(), key=lambda n: n.visits)
+        action = best.action
+        snap = grid.snapshot()
+        with muted():
+            apply_cpu_action(grid, action, EXPECTED)
+        self._reuse = (best, grid.snapshot())
+        grid.restore(snap)
+
+        if decision_log.enabled(INFO):
+            elapsed = perf_counter() - start
+            decision_log.log(INFO, "cpu_mcts", side=side, playouts=playouts, reused=reused,
+                             ms=round(elapsed * 1000, 2),
+                             playouts_per_s=round(playouts / elapsed) if elapsed else None,
+                             visits=best.visits, win_rate=round(best.wins / max(best.visits, 1), 3),
+                             action=best.key)
+        return action
+
+    # ==================================================
+    # TREE REUSE
+    # ==================================================
+    def _reused_root(self, grid, side):
+        """
+        The subtree for the opponent's actual reply, if it can be found:
+        each reply under last turn's choice is replayed (mean rolls) on the
+        board we expected after our action, and the one whose layout matches
+        the live board with the closest unit HP wins.
+        """
+        if self._reuse is None:
+            return None
+        chosen, after = self._reuse
+        self._reuse = None
+        if not chosen.children:
+            return None
+
+        target_layout = _occupancy(grid)
+        target_hp = {key: grid.tiles[c][r].card.hp for key, (c, r) in grid.unit_pos.items()}
+        live = grid.snapshot()
+        best, best_diff = None, None
+        with muted():
+            for child in chosen.children.values():
+                grid.restore(after)
+                if not _valid(grid, child.action, child.mover):
+                    continue
+                apply_cpu_action(grid, child.action, EXPECTED)
+                if _occupancy(grid) != target_layout:
+                    continue
+                diff = sum(abs(grid.tiles[c][r].card.hp - target_hp.get(key, 0))
+                           for key, (c, r) in grid.unit_pos.items())
+                if best_diff is None or diff < best_diff:
+                    best, best_diff = child, diff
+        grid.restore(live)
+        if best is None:
+            return None
+        best.parent = None
+        _rebind(best, grid)
+        return best
+
+    # ==================================================
+    # SEARCH
+    # ==================================================
+    def _spawn_workers(self, grid, side):
+        # only from a top-level process: inside cpu_worker's child a nested
+        # pool would outlive it and hang interpreter exit. Linux only, as in
+        # cpu_worker: forking on macOS after SDL/Cocoa started is unsafe
+        if self.workers <= 1 or multiprocessing.parent_process() is not None \
+                or not sys.platform.startswith("linux") \
+                or "fork" not in multiprocessing.get_all_start_methods():
+            return []
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers - 1,
+                                             mp_context=multiprocessing.get_context("fork"))
+        board = grid.clone()
+        settings = self.settings()
+        return [self._pool.submit(_worker_search, board, side, settings, self.rng.getrandbits(32))
+                for _ in range(self.workers - 1)]
+
+    def _search(self, grid, side, root):
+        rng = self.rng
+        deadline = perf_counter() + self.budget_ms / 1000 if self.budget_ms else None
+        snap = grid.snapshot()
+        playouts = 0
+        while playouts < self.playouts:
+            if deadline is not None and not playouts % 8 and perf_counter() > deadline:
+                break
+            node = self._select_expand(grid, root, side)
+            result = self._rollout(grid, other_side(node.mover), side, rng)
+            while node is not None:
+                node.visits += 1
+                node.wins += result if node.mover == side else 1.0 - result
+                node = node.parent
+            grid.restore(snap)
+            playouts += 1
+        return root, playouts
+
+    def _select_expand(self, grid, root, side):
+        rng = self.rng
+        node = root
+        while True:
+            to_move = other_side(node.mover)
+            if not grid.unit_count(to_move) or not grid.unit_count(node.mover):
+                return node
+            if node.untried is None:
+                node.untried = [(key, action) for _, key, action
+                                in reversed(self._gen.ordered_actions(grid, to_move))]
+            while node.untried:
+                key, action = node.untried.pop()
+                if key in node.children or not _valid(grid, action, to_move):
+                    continue
+                child = node.children[key] = Node(key, action, to_move, node)
+                apply_cpu_action(grid, action, rng)
+                self._tick(grid)
+                return child
+            if not node.children:
+                return node
+            log_n = math.log(node.visits + 1)
+            c = self.exploration
+            child = max(node.children.values(),
+                        key=lambda n: n.wins / n.visits + c * math.sqrt(log_n / n.visits)
+                        if n.visits else float("inf"))
+            if not _valid(grid, child.action, to_move):
+                return node
+            apply_cpu_action(grid, child.action, rng)
+            self._tick(grid)
+            node = child
+
+    def _tick(self, grid):
+        advance(grid, self.ticks_per_ply)
+
+    def _rollout(self, grid, to_move, side, rng):
+        """Greedy playout; returns side's win probability (1, 0 or estimate)."""
+        for _ in range(self.rollout_plies):
+            if not grid.unit_count(side):
+                return 0.0
+            if not grid.unit_count(other_side(side)):
+                return 1.0
+            action = rollout_action(grid, to_move, rng)
+            if action:
+                apply_cpu_action(grid, action, rng)
+                self._tick(grid)
+            to_move = other_side(to_move)
+        if not grid.unit_count(side):
+            return 0.0
+        if not grid.unit_count(other_side(side)):
+            return 1.0
+        return 1.0 / (1.0 + math.exp(-evaluate(grid, side) / EVAL_SCALE))
+
+
+def _rebind(node, grid):
+    """
+    Point a reused subtree's actions at this board's cards — the GUI thinks
+    on a fresh Grid.clone() every turn — matching units by (owner, index).
+    Actions of units that are gone are dropped along with their subtrees;
+    untried lists are rebuilt on the next visit.
+    """
+    tiles = grid.tiles
+    cards = {key: tiles[c][r].card for key, (c, r) in grid.unit_pos.items()}
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        n.untried = None
+        for key, child in list(n.children.items()):
+            old = child.action['card']
+            card = cards.get((old.owner, old.index))
+            if card is None:
+                del n.children[key]
+                continue
+            if card is not old:
+                child.action = dict(child.action, card=card)
+            stack.append(child)
@@ -0,0 +1,153 @@
+"""
+Turn planner CPU (optional controller, headless).
+
+Plans one joint turn for every unit of a side — at most one move and one
+attack each — with a beam search over the units.
+
+- Units are planned in board order. A unit's options: hold, attack in
+  place, move, move then attack from the new tile, attack then move (the
+  candidates of alphabeta_cpu.unit_actions, best few moves only).
+- Options are applied to the board itself (mean rolls, muted events) on
+  top of the earlier units' plans, so conflicts resolve by the rules: a
+  tile another unit already walked to is no longer a legal destination,
+  and a target that dies is gone, so nobody else spends an attack on it.
+- Plans are scored with alphabeta_cpu.evaluate; the best `beam_width`
+  partial plans survive each unit.
+- budget_ms bounds planning (250 ms by default): when it runs out, the
+  best plan found so far is played and the remaining units hold.
+
+plan_turn() opts the side into multi-action turns: engine.decide_turn
+takes the whole plan and Game.apply_turn plays it in one turn (the GUI
+and simulate.py do). Called as a plain single-action controller it
+replans every turn and plays one step of the plan: the unit action
+(first step of a unit's plan) that is best on its own with the opponent
+to move. Playing a whole plan across several turns lets the opponent
+answer each step, and loses badly against even the greedy CPU.
+"""
+from time import perf_counter
+
+import decision_log
+from decision_log import INFO
+from events import muted
+from logic_cpu.advanced_cpu import advanced_cpu_turn, apply_cpu_action
+from logic_cpu.alphabeta_cpu import EXPECTED, action_key, evaluate, other_side, unit_actions
+
+
+class TurnPlanner:
+    def __init__(self, beam_width=4, moves_per_unit=3, follow_ups=2, budget_ms=250):
+        self.beam_width = beam_width
+        self.moves_per_unit = moves_per_unit
+        self.follow_ups = follow_ups    # second actions tried per first action
+        self.budget_ms = budget_ms      # None = always plan every unit
+
+    def __call__(self, grid, side="enemy"):
+        plan = self.plan(grid, side)
+        if not plan:
+            # every unit holds: fall back to the greedy single action
+            return advanced_cpu_turn(grid, side)
+        return self.first_step(grid, side, plan)
+
+    def plan_turn(self, grid, side="enemy"):
+        """The whole turn: every unit's planned actions, in play order."""
+        plan = self.plan(grid, side)
+        if not plan:
+            action = advanced_cpu_turn(grid, side)
+            return [action] if action else []
+        return plan
+
+    def first_step(self, grid, side, plan):
+        """
+        The plan's action to play now: each unit's first planned action is
+        tried alone and the one that leaves the best position with the
+        opponent to move wins (a move that walks into range only pays off
+        if the unit survives the reply).
+        """
+        foe = other_side(side)
+        snap = grid.snapshot()
+        best, best_value, seen = None, None, set()
+        with muted():
+            for action in plan:
+                unit = (action['card'].owner, action['card'].index)
+                if unit in seen:
+                    continue
+                seen.add(unit)
+                apply_cpu_action(grid, action, EXPECTED)
+                value = -evaluate(grid, foe)
+                grid.restore(snap)
+                if best_value is None or value > best_value:
+                    best, best_value = action, value
+        return best
+
+    # ==================================================
+    # PLANNING (beam search over units)
+    # ==================================================
+    def plan(self, grid, side):
+        """Best joint plan for this turn: a list of actions, in play order."""
+        start = perf_counter()
+        deadline = start + self.budget_ms / 1000 if self.budget_ms else None
+        units = grid.positions(side)
+        root = grid.snapshot()
+        self.evaluated = 0
+
+        beam = [(evaluate(grid, side), [])]
+        planned = 0
+        with muted():
+            for pos in units:
+                expanded = []
+                done = 0
+                for value, plan in beam:
+                    if deadline is not None and perf_counter() > deadline:
+                        break
+                    grid.restore(root)
+                    for action in plan:
+                        apply_cpu_action(grid, action, EXPECTED)
+                    self._expand(grid, side, pos, plan, expanded)
+                    done += 1
+                if not done:
+                    break
+                # plans that did not get expanded in time still compete
+                expanded.extend(beam[done:])
+                expanded.sort(key=lambda e: e[0], reverse=True)
+                beam = expanded[:self.beam_width]
+                planned += 1
+                if deadline is not None and perf_counter() > deadline:
+                    break
+            grid.restore(root)
+
+        value, plan = beam[0]
+        if decision_log.enabled(INFO):
+            decision_log.log(INFO, "cpu_plan", side=side, units=len(units), planned=planned,
+                             evaluated=self.evaluated, value=value,
+                             ms=round((perf_counter() - start) * 1000, 2),
+                             plan=[action_key(a) for a in plan])
+        return plan
+
+    def _expand(self, grid, side, pos, plan, out):
+        """Append (value, plan + option) for every option of the unit on pos."""
+        out.append((evaluate(grid, side), plan))     # hold
+        self.evaluated += 1
+        if grid.tiles[pos[0]][pos[1]].card is None:
+            return
+        base = grid.snapshot()
+        foes = grid.positions(other_side(side))
+        for _, _, action in unit_actions(grid, pos, foes, self.moves_per_unit):
+            apply_cpu_action(grid, action, EXPECTED)
+            out.append((evaluate(grid, side), plan + [action]))
+            self.evaluated += 1
+
+            # the unit's other action: attack after moving, move after attacking
+            foes_now = grid.positions(other_side(side))
+            if action['type'] == 'MOVE':
+                follow = unit_actions(grid, action['new_pos'], foes_now, 0)
+            else:
+                follow = [t for t in unit_actions(grid, pos, foes_now, self.follow_ups)
+                          if t[2]['type'] == 'MOVE']
+            if follow:
+                follow.sort(key=lambda t: t[0], reverse=True)
+                after = grid.snapshot()
+                for _, _, second in follow[:self.follow_ups]:
+                    apply_cpu_action(grid, second, EXPECTED)
+                    out.append((evaluate(grid, side), plan + [action, second]))
+                    self.evaluated += 1
+                    grid.restore(after)
+            grid.restore(base)
@@ -0,0 +1,50 @@
+"""
+Zobrist hashing of a board position (for transposition tables).
+
+Every feature of a position gets a fixed random 64-bit key; a position's
+hash is the XOR of the keys of the features present:
+- unit (owner, card index) standing on tile i
+- that unit's current HP, shield and healed_once flag
+- burn / regen still pending on a unit: the summed amount per (unit,
+  ticks left), so two equal effects on one unit cannot XOR each other out
+- flame tiles (tile, owner)
+- side to move
+Keys are drawn lazily from a fixed-seed RNG, so hashes are stable within
+a process and identical positions always collide on purpose.
+"""
+import random
+
+_rng = random.Random(0x5EED)
+_keys = {}
+
+
+def _key(feature):
+    k = _keys.get(feature)
+    if k is None:
+        k = _keys[feature] = _rng.getrandbits(64)
+    return k
+
+
+def position_hash(grid, side):
+    h = _key(("side", side))
+    rows = grid.rows
+    tiles = grid.tiles
+    for (owner, index), (c, r) in grid.unit_pos.items():
+        card = tiles[c][r].card
+        h ^= _key(("unit", owner, index, c * rows + r))
+        h ^= _key(("hp", owner, index, card.hp))
+        if card.shield:
+            h ^= _key(("shield", owner, index, card.shield))
+        if card.healed_once:
+            h ^= _key(("healed", owner, index))
+    fx = grid.effects
+    pending = {}
+    for kind, effects in (("burn", fx.burn), ("regen", fx.regen)):
+        for card, amount, expires in effects.values():
+            bucket = (kind, card.owner, card.index, fx.left(expires))
+            pending[bucket] = pending.get(bucket, 0) + amount
+    for bucket, total in pending.items():
+        h ^= _key((*bucket, total))
+    for (c, r), (expires, owner) in fx.flames.items():
+        h ^= _key(("flame", c * rows + r, owner, fx.left(expires)))
+    return h
@@ -1,18 +1,17 @@
 import pygame
-import random
 
 from config import *
-from game_grid import Grid, cell_center
-from animations import anim_mgr
-from effects import (
-    flame_tiles, regen_effects, burn_effects,
-    process_flame_tiles, process_regen, process_burn
-)
-from logic_attack import initiate_player_attack
-from logic_cpu.advanced_cpu import advanced_cpu_turn as cpu_turn
+from game_grid import cell_center
+from engine import Game, check_win_lose
+from animations import anim_mgr, fx_rng
+from ui_actions import initiate_player_attack, cpu_turn, poll_cpu_turn
+from cpu_worker import cpu_worker
+import events
+import card_view
+import decision_log
 from ui_draw import draw_ui, spawn_confetti, update_and_draw_confetti, draw_help_overlay
 from card import Card
-from attack import Attack
+from attack import make_attack
 from colors import *
 from fonts import *
 import math
@@ -21,11 +20,17 @@ pygame.init()
 pygame.display.set_caption("Card Strike: Elemental GUI")
 screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
 clock = pygame.time.Clock()
+events.subscribe(anim_mgr.on_engine_event)
+events.subscribe(card_view.on_engine_event)
+decision_log.set_level(DECISION_LOG_LEVEL)
+if DECISION_LOG_FILE:
+    decision_log.open_sink(DECISION_LOG_FILE)
 
 # -------------------------------------------------
 # GAME STATE
 # -------------------------------------------------
-grid = Grid(GRID_COLS, GRID_ROWS)
+game = Game(GRID_COLS, GRID_ROWS, cpu=CPU_DIFFICULTY)
+grid = game.grid
 
 selected_pos = None
 hovered_cell = (0, 0)
@@ -41,107 +46,67 @@ selected_player_element = "fire"  # default
 # -------------------------------------------------
 # CARD FACTORIES
 # -------------------------------------------------
+# Attacks are immutable and interned, so every card of an element shares
+# the same tuple.
+ELEMENT_ATTACKS = {
+    "fire": (
+        make_attack("Burning Trail", 12, "fire", 5, behavior="fire_trail"),
+        make_attack("Fire Claw", 14, "fire", 4),
+        make_attack("Inferno Burst", 16, "fire", 5),
+    ),
+    "water": (
+        make_attack("Water Lash", 10, "water", 5),
+        make_attack("Tidal Push", 12, "water", 4),
+        make_attack("Healing Wave", 8, "water", 4, behavior="heal"),
+    ),
+    "leaf": (
+        make_attack("Nature's Embrace", 10, "leaf", 4, behavior="embrace"),
+        make_attack("Vine Whip", 12, "leaf", 5),
+        make_attack("Thorn Burst", 14, "leaf", 4),
+    ),
+    "null": (
+        make_attack("Strike", 12, "null", 4),
+        make_attack("Guard Break", 14, "null", 4),
+        make_attack("Focused Blow", 16, "null", 3),
+    ),
+}
+
+
 def create_player_card(slot_index: int, element: str) -> Card:
-    if element == "fire":
-        attacks = [
-            Attack("Burning Trail", 12, "fire", 5),
-            Attack("Fire Claw", 14, "fire", 4),
-            Attack("Inferno Burst", 16, "fire", 5),
-        ]
-    elif element == "water":
-        attacks = [
-            Attack("Water Lash", 10, "water", 5),
-            Attack("Tidal Push", 12, "water", 4),
-            Attack("Healing Wave", 8, "water", 4),
-        ]
-    elif element == "leaf":
-        attacks = [
-            Attack("Nature's Embrace", 10, "leaf", 4),
-            Attack("Vine Whip", 12, "leaf", 5),
-            Attack("Thorn Burst", 14, "leaf", 4),
-        ]
-    else:  # null
-        attacks = [
-            Attack("Strike", 12, "null", 4),
-            Attack("Guard Break", 14, "null", 4),
-            Attack("Focused Blow", 16, "null", 3),
-        ]
-
-    card = Card(
+    return Card(
         owner="player",
         name=f"Hero {slot_index+1}",
         hp=100,
         max_hp=100,
-        attacks=attacks,
+        attacks=ELEMENT_ATTACKS.get(element, ELEMENT_ATTACKS["null"]),
         move_range=3,
         element=element,
         index=slot_index
     )
-    card.display_hp = card.hp
-    return card
-
-
-def create_enemy_card(slot_index: int) -> Card:
-    e = random.choice(["fire", "water", "leaf", "null"])
-    if e == "fire":
-        attacks = [
-            Attack("Burning Trail", 12, "fire", 5),
-            Attack("Fire Claw", 14, "fire", 4),
-            Attack("Inferno Burst", 16, "fire", 5),
-        ]
-    elif e == "water":
-        attacks = [
-            Attack("Water Lash", 10, "water", 5),
-            Attack("Tidal Push", 12, "water", 4),
-            Attack("Healing Wave", 8, "water", 4),
-        ]
-    elif e == "leaf":
-        attacks = [
-            Attack("Nature's Embrace", 10, "leaf", 4),
-            Attack("Vine Whip", 12, "leaf", 5),
-            Attack("Thorn Burst", 14, "leaf", 4),
-        ]
-    else:  # null
-        attacks = [
-            Attack("Strike", 12, "null", 4),
-            Attack("Guard Break", 14, "null", 4),
-            Attack("Focused Blow", 16, "null", 3),
-        ]
-    card = Card(
+
+
+def create_enemy_card(slot_index: int, rng) -> Card:
+    e = rng.choice(["fire", "water", "leaf", "null"])
+    return Card(
         owner="enemy",
         name=f"Beast {slot_index+1}",
         hp=100,
         max_hp=100,
-        attacks=attacks,
+        attacks=ELEMENT_ATTACKS[e],
         move_range=2,
         element=e,
         index=slot_index
     )
-    card.display_hp = card.hp
-    return card
-
-
-def check_win_lose(grid):
-    player_alive = any(
-        tile.card and tile.card.owner == "player"
-        for col in grid.tiles for tile in col
-    )
-    enemy_alive = any(
-        tile.card and tile.card.owner == "enemy"
-        for col in grid.tiles for tile in col
-    )
-    if not enemy_alive:
-        return "victory"
-    if not player_alive:
-        return "defeat"
-    return "playing"
 
 
 # -------------------------------------------------
 # STEALING PHASE SETUP
 # -------------------------------------------------
 from stealing_phase import StealingPhase
-stealing_phase = StealingPhase(screen)
+from draft import CARD_POOL
+from draft_solver import DraftSolver
+stealing_phase = StealingPhase(screen, game.rng,
+                               solver=DraftSolver(CARD_POOL) if DRAFT_SOLVER else None)
 stealing_phase_active = True
 player_final_cards = []
 cpu_final_cards = []
@@ -153,7 +118,7 @@ game_state = "playing"
 running = True
 
 while running:
-    clock.tick(FPS)
+    dt = clock.tick(FPS) / 1000
     # -----------------------------
     # STEALING PHASE (runs first)
     # -----------------------------
@@ -188,13 +153,12 @@ while running:
     # UPDATE LOGIC
     # -----------------------------
     anim_mgr.update()
-    process_flame_tiles(grid)
-    process_regen()
-    process_burn(grid)
+    game.update(dt)
+    poll_cpu_turn(game)
 
     if cpu_pending and not anim_mgr.blocking and not placing_phase:
         cpu_pending = False
-        cpu_turn(grid)
+        cpu_turn(game)
         game_state = check_win_lose(grid)
 
     mx, my = pygame.mouse.get_pos()
@@ -238,28 +202,18 @@ while running:
                 if grid.tiles[c][r].card is None and placed_count < len(player_final_cards):
                     # Use card from stealing phase if available
                     if player_final_cards:
-                        grid.tiles[c][r].card = player_final_cards[placed_count]
+                        game.place(player_final_cards[placed_count], (c, r))
                     else:
-                        grid.tiles[c][r].card = create_player_card(
+                        game.place(create_player_card(
                             placed_count, selected_player_element
-                        )
+                        ), (c, r))
                     placed_count += 1
                     anim_mgr.add_particle(*cell_center(c, r), "leaf")
 
                     if placed_count >= 3:
                         placing_phase = False
-                        empties = [
-                            (x, y)
-                            for x in range(GRID_COLS)
-                            for y in range(GRID_ROWS)
-                            if not grid.tiles[x][y].card
-                        ]
                         # Place CPU cards from stealing phase
-                        for i, cpu_card in enumerate(cpu_final_cards):
-                            if empties:
-                                ex, ey = random.choice(empties)
-                                grid.tiles[ex][ey].card = cpu_card
-                                empties.remove((ex, ey))
+                        game.place_randomly(cpu_final_cards)
 
             else:
                 clicked = grid.tiles[c][r].card
@@ -267,22 +221,17 @@ while running:
                     selected_pos = (c, r)
                 elif selected_pos:
                     sc, sr = selected_pos
-                    mover = grid.tiles[sc][sr].card
-                    if mover:
-                        dist = abs(c - sc) + abs(r - sr)
-                        if dist <= mover.move_range and not clicked:
-                            grid.tiles[c][r].card = mover
-                            grid.tiles[sc][sr].card = None
-                            selected_pos = None
-                            anim_mgr.add_particle(*cell_center(c, r), "air")
-                            cpu_pending = True
+                    if game.move((sc, sr), (c, r)):
+                        selected_pos = None
+                        anim_mgr.add_particle(*cell_center(c, r), "air")
+                        cpu_pending = True
 
         # ---------------------------------
         # COMBAT KEYS
         # ---------------------------------
         if event.type == pygame.KEYDOWN and not placing_phase and not anim_mgr.blocking:
             if event.key == pygame.K_m:
-                cpu_turn(grid)
+                cpu_turn(game)
 
             controls = {
                 pygame.K_q: (0, 0), pygame.K_w: (0, 1), pygame.K_e: (0, 2),
@@ -301,7 +250,7 @@ while running:
                 )
 
                 if target_idx != -1:
-                    initiate_player_attack(pid, aid, target_idx, grid)
+                    initiate_player_attack(game, pid, aid, target_idx)
                     cpu_pending = True
                 else:
                     anim_mgr.add_floating_text(
@@ -350,10 +299,10 @@ while running:
             icon_text = "✕"
             # Ash particles for defeat
             for _ in range(2):
-                ax = random.randint(0, WIDTH)
-                ay = random.randint(0, HEIGHT)
-                ash_a = random.randint(20, 60)
-                pygame.draw.circle(screen, (*C_TEXT_DIM, ash_a), (ax, ay), random.randint(1, 3))
+                ax = fx_rng.randint(0, WIDTH)
+                ay = fx_rng.randint(0, HEIGHT)
+                ash_a = fx_rng.randint(20, 60)
+                pygame.draw.circle(screen, (*C_TEXT_DIM, ash_a), (ax, ay), fx_rng.randint(1, 3))
 
         # ── Trophy / Skull icon ──
         icon_surf = FONT_HERO.render(icon_text, True, title_color)
@@ -373,8 +322,8 @@ while running:
         pygame.draw.rect(screen, (*C_BG_TERTIARY, 220), panel_rect, border_radius=RADIUS_MD)
         pygame.draw.rect(screen, C_ACCENT_DARK, panel_rect, 2, border_radius=RADIUS_MD)
 
-        p_alive = sum(1 for col in grid.tiles for tile in col if tile.card and tile.card.owner == "player")
-        e_alive = sum(1 for col in grid.tiles for tile in col if tile.card and tile.card.owner == "enemy")
+        p_alive = grid.unit_count("player")
+        e_alive = grid.unit_count("enemy")
         stat1 = FONT_MAIN.render(f"Your Units Alive: {p_alive}", True, C_PLAYER_GLOW)
         stat2 = FONT_MAIN.render(f"Enemy Units Alive: {e_alive}", True, C_ENEMY_GLOW)
         screen.blit(stat1, (px + 24, py + 24))
@@ -396,13 +345,17 @@ while running:
         for ev in pygame.event.get(pygame.MOUSEBUTTONDOWN):
             if btn_rect.collidepoint(ev.pos):
                 # Reset everything
-                grid = Grid(GRID_COLS, GRID_ROWS)
+                cpu_worker.reset()
+                game = Game(GRID_COLS, GRID_ROWS, cpu=CPU_DIFFICULTY)
+                grid = game.grid
+                card_view.clear_views()
                 selected_pos = None
                 placing_phase = True
                 placed_count = 0
                 cpu_pending = False
                 game_state = "playing"
                 show_help = False
+                stealing_phase.rng = game.rng
                 stealing_phase.reset()
                 stealing_phase_active = True
                 player_final_cards = []
@@ -414,4 +367,5 @@ while running:
 
     pygame.display.flip()
 
+cpu_worker.shutdown()
 pygame.quit()
@@ -0,0 +1,159 @@
+"""
+Legal action generation (headless), shared by the CPUs, the GUI's range
+highlight and action validation.
+
+A legal action for the side to move is either
+- MOVE:   a unit walks to an empty tile within move_range steps (enemies
+          block the path, allies can be passed through), or
+- ATTACK: a unit uses one of its attacks on an enemy within attack_range
+          (Manhattan). Heal attacks heal the caster's team and are aimed
+          at the caster's own tile.
+
+Actions are the same dicts the CPUs return and Game.apply() takes.
+
+Every grid owns one ActionGen (grid.movegen). It caches each unit's moves
+and attack targets and keeps them up to date incrementally: on each query
+it diffs the owner bitboards against the last ones it saw, and only units
+whose zone (move range or attack reach around them, whichever is larger)
+overlaps a changed tile are recomputed. That holds after real turns as
+well as after a search's snapshot()/restore(). Recomputed moves are
+memoized on the occupancy inside the unit's move range only, so a search
+that shuffles units elsewhere on the board never redoes the BFS.
+"""
+from pathfinding import move_targets
+
+MOVE_MEMO_MAX = 100000
+
+
+def other_side(side):
+    return "player" if side == "enemy" else "enemy"
+
+
+class ActionGen:
+    def __init__(self, grid):
+        self.grid = grid
+        self._units = {}    # card -> (pos, zone mask, moves, attacks)
+        self._masks = {}    # owner bitboards at the last sync
+        self._move_memo = {}  # (pos, range, owner, occupancy near pos) -> moves
+
+    # ------------------------------
+    # INCREMENTAL UPDATE
+    # ------------------------------
+    def _sync(self):
+        masks = self.grid.owner_masks
+        if masks == self._masks:
+            return
+        changed = 0
+        for owner in masks.keys() | self._masks.keys():
+            changed |= masks.get(owner, 0) ^ self._masks.get(owner, 0)
+        self._masks = dict(masks)
+        if changed:
+            self._units = {card: e for card, e in self._units.items() if not e[1] & changed}
+
+    def _entry(self, pos):
+        self._sync()
+        grid = self.grid
+        card = grid.tiles[pos[0]][pos[1]].card
+        if card is None:
+            return None
+        entry = self._units.get(card)
+        if entry is None or entry[0] != pos:
+            feats = card.features
+            foe = other_side(card.owner)
+            attacks = []
+            for atk, heal in zip(card.attacks, feats.heal_flags):
+                if heal:
+                    attacks.append((atk, pos))
+                    continue
+                for tpos in grid.units_in_range(foe, pos, atk.attack_range):
+                    attacks.append((atk, tpos))
+            entry = self._units[card] = (
+                pos,
+                grid.geo.range_mask(pos, max(card.move_range, feats.reach)),
+                self._moves(pos, card),
+                tuple(attacks),
+            )
+        return entry
+
+    def _moves(self, pos, card):
+        grid = self.grid
+        masks = self._masks
+        zone = grid.geo.range_mask(pos, card.move_range)
+        own = masks.get(card.owner, 0) & zone
+        foes = masks.get(other_side(card.owner), 0) & zone
+        key = (pos, card.move_range, card.owner, own, foes)
+        moves = self._move_memo.get(key)
+        if moves is None:
+            if len(self._move_memo) >= MOVE_MEMO_MAX:
+                self._move_memo.clear()
+            moves = self._move_memo[key] = tuple(move_targets(grid, pos, card.move_range))
+        return moves
+
+    # ------------------------------
+    # QUERIES
+    # ------------------------------
+    def moves(self, pos):
+        """Empty tiles the unit on pos can move to, in BFS order."""
+        entry = self._entry(pos)
+        return entry[2] if entry else ()
+
+    def attacks(self, pos):
+        """(attack, target) pairs the unit on pos can play right now."""
+        entry = self._entry(pos)
+        return entry[3] if entry else ()
+
+    def actions(self, side):
+        """Every legal action of `side`: each unit's attacks, then its moves."""
+        tiles = self.grid.tiles
+        out = []
+        for pos in self.grid.positions(side):
+            card = tiles[pos[0]][pos[1]].card
+            _, _, moves, attacks = self._entry(pos)
+            for atk, target in attacks:
+                out.append({'type': 'ATTACK', 'card': card, 'pos': pos,
+                            'target': target, 'attack': atk})
+            for new_pos in moves:
+                out.append({'type': 'MOVE', 'card': card, 'pos': pos, 'new_pos': new_pos})
+        return out
+
+    # ------------------------------
+    # VALIDATION
+    # ------------------------------
+    def can_move(self, pos, new_pos):
+        return new_pos in self.moves(pos)
+
+    def can_attack(self, pos, target, atk):
+        """
+        Could the unit on pos use atk on target? The rules accept any tile
+        within attack_range (the player may aim a heal at an enemy, too).
+        """
+        card = self.grid.tiles[pos[0]][pos[1]].card
+        if card is None or atk not in card.attacks:
+            return False
+        return self.grid.geo.distance(pos, target) <= atk.attack_range
+
+    def is_legal(self, action, side=None):
+        """Validate an action dict (e.g. from a replay) against this board."""
+        pos = action['pos']
+        card = self.grid.tiles[pos[0]][pos[1]].card
+        if card is None or card is not action['card']:
+            return False
+        if side is not None and card.owner != side:
+            return False
+        if action['type'] == 'MOVE':
+            return self.can_move(pos, action['new_pos'])
+        if action['type'] == 'ATTACK':
+            return self.can_attack(pos, action['target'], action['attack'])
+        return False
+
+    def is_playable(self, action, side=None):
+        """
+        is_legal, and an attack still has something to affect: it is one
+        of the unit's attacks() (a foe in range, or the caster's own tile
+        for heals), so a queued strike on a unit that already died is not.
+        """
+        if not self.is_legal(action, side):
+            return False
+        if action['type'] == 'ATTACK':
+            return (action['attack'], action['target']) in self.attacks(action['pos'])
+        return True
@@ -0,0 +1,90 @@
+"""
+Occupancy-aware pathfinding on the grid graph.
+
+Every query picks a blocking rule:
+- IGNORE_UNITS  — units are transparent (attack range)
+- BLOCK_ENEMIES — tiles held by the other side cannot be entered (movement)
+- BLOCK_ALL     — any occupied tile cannot be entered (no mover: nobody
+  is an ally)
+
+Distance maps are flat lists indexed by  c * rows + r  (the same column-major
+order as grid.tiles), with UNREACHABLE for tiles outside the search.
+"""
+
+IGNORE_UNITS = "ignore_units"
+BLOCK_ENEMIES = "block_enemies"
+BLOCK_ALL = "block_all"
+
+UNREACHABLE = -1
+
+
+def _bfs(grid, sources, max_depth, block, owner):
+    """
+    Multi-source, level-by-level BFS.
+    Returns (dist, order): flat distance map + tile indices in visit order.
+    Source tiles are always part of the result, even when occupied.
+    """
+    rows = grid.rows
+    neighbors = grid.geo.neighbors
+    dist = [UNREACHABLE] * grid.geo.size
+    # occupied tiles this rule forbids entering, as a bitboard
+    blocked = 0
+    if block != IGNORE_UNITS:
+        for side, mask in grid.owner_masks.items():
+            if block == BLOCK_ALL or side != owner:
+                blocked |= mask
+
+    frontier = []
+    for (c, r) in sources:
+        i = c * rows + r
+        if dist[i] == UNREACHABLE:
+            dist[i] = 0
+            frontier.append(i)
+    order = list(frontier)
+
+    depth = 0
+    while frontier and depth < max_depth:
+        depth += 1
+        nxt = []
+        for i in frontier:
+            # geo.neighbors order: right, left, down, up
+            for j in neighbors[i]:
+                if dist[j] != UNREACHABLE or blocked >> j & 1:
+                    continue
+                dist[j] = depth
+                nxt.append(j)
+        order.extend(nxt)
+        frontier = nxt
+
+    return dist, order
+
+
+def distance_map(grid, sources, max_depth, block=IGNORE_UNITS, owner=None):
+    """
+    Flat distance map from the nearest of `sources` (list of (c, r)),
+    limited to max_depth steps. `owner` is the moving side for BLOCK_ENEMIES.
+    """
+    return _bfs(grid, sources, max_depth, block, owner)[0]
+
+
+def reachable_tiles(grid, start, max_depth, block=IGNORE_UNITS, owner=None):
+    """
+    All (c, r) within max_depth steps of start, in BFS order (start first).
+    """
+    rows = grid.rows
+    _, order = _bfs(grid, [start], max_depth, block, owner)
+    return [divmod(i, rows) for i in order]
+
+
+def move_targets(grid, pos, move_range):
+    """
+    Empty tiles the unit at pos can walk to this turn (enemies block the
+    path, allies can be passed through but not stopped on). From an empty
+    pos every unit is in the way.
+    """
+    card = grid.tiles[pos[0]][pos[1]].card
+    block, owner = (BLOCK_ENEMIES, card.owner) if card else (BLOCK_ALL, None)
+    return [
+        (c, r) for (c, r) in reachable_tiles(grid, pos, move_range, block, owner)
+        if grid.tiles[c][r].card is None
+    ]
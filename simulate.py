@@ -0,0 +1,247 @@
+"""
+Batch self-play simulator — CPU vs CPU, no rendering.
+
+    python simulate.py -n 2000 --workers 8 --seed 1 --json stats.json
+
+Every game runs the full flow headless: draft (Draft.auto_turn for both
+sides), random placement, then alternating CPU turns (one action, or a
+planner's whole plan) with persistent effects ticking in between. Games are spread over a process
+pool; game i uses seed (seed + i), so any single game can be replayed
+with  --seed S -n 1 --workers 1.
+
+The CPU's decisions (candidates, scores, chosen actions, draft picks) can
+be dumped with  --log-level debug --log-file decisions.jsonl ; every
+record carries the game's seed.
+
+MCTS controllers are seeded from the game seed, so replays match as long
+as playouts (not budget_ms) bound the search. --mcts-workers N gives each
+MCTS side N root-parallel search processes (in-process games only).
+
+--draft solver makes the enemy draft with draft_solver (in memory, no disk
+cache). --card-strength PATH writes the per-card strengths the solver
+learns from (log-odds of each card's win rate); card_strength.json comes
+from  --draft random -n 20000 , so every card is seen in unbiased decks.
+"""
+import argparse
+import json
+import math
+import os
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+import decision_log
+from config import GRID_COLS, GRID_ROWS, TICK_RATE, CPU_LEVELS
+from draft import Draft, CARD_POOL
+from draft_solver import DraftSolver
+from engine import Game, CPU_KINDS, cpu_kind
+
+TICKS_PER_TURN = TICK_RATE  # effect ticks between two actions (1s of GUI time)
+MAX_TURNS = 400          # game is a draw after this many actions
+MAX_DRAFT_STEPS = 50     # guard against drafts that stall
+
+_draft_solver = None     # per process, built on first use
+
+
+# ═══════════════════════════════════════
+# ONE GAME
+# ═══════════════════════════════════════
+def play_game(seed, max_turns=MAX_TURNS, player_cpu="greedy", enemy_cpu="greedy",
+              draft="heuristic", mcts_workers=1):
+    decision_log.bind(game=seed)
+    return _play(seed, max_turns, player_cpu, enemy_cpu, draft, mcts_workers)
+
+
+def _random_pick(draft, side, rng):
+    """Uniformly random retain/steal (unbiased decks for --card-strength)."""
+    if side == "cpu":
+        hand, opp_hand, deck = draft.cpu_hand, draft.player_hand, draft.cpu_deck
+    else:
+        hand, opp_hand, deck = draft.player_hand, draft.cpu_hand, draft.player_deck
+    pool = [(hand, i) for i in range(len(hand))] + [(opp_hand, i) for i in range(len(opp_hand))]
+    source, i = rng.choice(pool)
+    deck.append(source.pop(i))
+    draft.end_turn()
+
+
+def _solver():
+    global _draft_solver
+    if _draft_solver is None:
+        _draft_solver = DraftSolver(CARD_POOL, cache_file=None)
+    return _draft_solver
+
+
+def _init_log(level, path):
+    """Per-process decision-log setup (also used as the Pool initializer)."""
+    decision_log.set_level(level)
+    if path:
+        decision_log.open_sink(path)
+
+
+def _play(seed, max_turns, player_cpu, enemy_cpu, draft_mode, mcts_workers=1):
+    # One seeded RNG drives the whole game (draft deal, placement, rolls);
+    # the controllers' own RNGs are seeded from the same seed
+    game = Game(GRID_COLS, GRID_ROWS, seed=seed)
+    for side, cpu in (("player", player_cpu), ("enemy", enemy_cpu)):
+        if mcts_workers > 1 and cpu_kind(cpu) == "mcts":
+            game.set_cpu(side, cpu, workers=mcts_workers)
+        else:
+            game.set_cpu(side, cpu)
+
+    # ── 1. Draft ──
+    draft = Draft(game.rng, solver=_solver() if draft_mode == "solver" else None)
+    steps = 0
+    while not draft.phase_complete and steps < MAX_DRAFT_STEPS:
+        if draft_mode == "random":
+            _random_pick(draft, draft.current_turn, game.rng)
+        else:
+            draft.auto_turn(draft.current_turn)
+        steps += 1
+    player_cards, enemy_cards = draft.get_final_decks()
+
+    # ── 2. Placement (random empty tiles, like the CPU in main.py) ──
+    game.place_randomly(player_cards + enemy_cards)
+
+    # ── 3. Combat (player side moves first, as in the GUI) ──
+    side = "player"
+    turns = 0
+    while game.status() == "playing" and turns < max_turns:
+        game.apply_turn(game.cpu_turn(side), side)
+        game.advance(TICKS_PER_TURN)
+        side = "enemy" if side == "player" else "player"
+        turns += 1
+
+    game.close_cpu()
+    status = game.status()
+    winner = {"victory": "player", "defeat": "enemy"}.get(status, "draw")
+
+    grid = game.grid
+    survivors = [grid.tiles[c][r].card.name
+                 for owner in ("player", "enemy") for (c, r) in grid.positions(owner)]
+    return {
+        "seed": seed,
+        "winner": winner,
+        "turns": turns,
+        "player_cards": [c.name for c in player_cards],
+        "enemy_cards": [c.name for c in enemy_cards],
+        "survivors": survivors,
+    }
+
+
+# ═══════════════════════════════════════
+# AGGREGATION
+# ═══════════════════════════════════════
+def aggregate(results):
+    n = len(results)
+    winners = Counter(r["winner"] for r in results)
+    lengths = sorted(r["turns"] for r in results)
+
+    cards = {}
+    for r in results:
+        survivors = Counter(r["survivors"])
+        for side in ("player", "enemy"):
+            for name in r[f"{side}_cards"]:
+                st = cards.setdefault(name, {"games": 0, "wins": 0, "survived": 0})
+                st["games"] += 1
+                if r["winner"] == side:
+                    st["wins"] += 1
+                if survivors[name] > 0:
+                    survivors[name] -= 1
+                    st["survived"] += 1
+
+    for st in cards.values():
+        st["win_rate"] = st["wins"] / st["games"]
+        st["survival_rate"] = st["survived"] / st["games"]
+
+    return {
+        "games": n,
+        "win_rate": {k: winners[k] / n for k in ("player", "enemy", "draw")} if n else {},
+        "length": {
+            "mean": sum(lengths) / n if n else 0,
+            "median": lengths[n // 2] if n else 0,
+            "min": lengths[0] if n else 0,
+            "max": lengths[-1] if n else 0,
+        },
+        "cards": cards,
+    }
+
+
+def card_strengths(stats):
+    """Per-card strength: log-odds of its win rate (add-one smoothed)."""
+    return {
+        name: round(math.log((st["wins"] + 1) / (st["games"] - st["wins"] + 1)), 4)
+        for name, st in sorted(stats["cards"].items())
+    }
+
+
+def print_report(stats, elapsed):
+    n = stats["games"]
+    print(f"{n} games in {elapsed:.1f}s ({n / max(elapsed, 1e-9):.1f} games/s)")
+    wr = stats["win_rate"]
+    print(f"Win rate  player {wr['player']:.1%}  enemy {wr['enemy']:.1%}  draw {wr['draw']:.1%}")
+    ln = stats["length"]
+    print(f"Length    mean {ln['mean']:.1f}  median {ln['median']}  min {ln['min']}  max {ln['max']}")
+    print()
+    print(f"{'Card':<18}{'games':>7}{'win%':>8}{'surv%':>8}")
+    for name, st in sorted(stats["cards"].items(), key=lambda kv: -kv[1]["win_rate"]):
+        print(f"{name:<18}{st['games']:>7}{st['win_rate']:>8.1%}{st['survival_rate']:>8.1%}")
+
+
+# ═══════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="CPU vs CPU batch simulation")
+    ap.add_argument("-n", "--games", type=int, default=100)
+    ap.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    ap.add_argument("--workers", type=int, help="game processes (default: CPU count, "
+                                                 "or 1 with --mcts-workers)")
+    ap.add_argument("--max-turns", type=int, default=MAX_TURNS)
+    ap.add_argument("--json", help="write aggregated stats (and per-game results) here")
+    cpus = list(CPU_KINDS) + list(CPU_LEVELS)
+    ap.add_argument("--player-cpu", default="greedy", choices=cpus, help="controller kind or difficulty level")
+    ap.add_argument("--enemy-cpu", default="greedy", choices=cpus, help="controller kind or difficulty level")
+    ap.add_argument("--log-level", default="off", choices=["debug", "info", "warning", "off"],
+                    help="decision log level (default: off)")
+    ap.add_argument("--log-file", help="append the decision log here as JSON lines")
+    ap.add_argument("--draft", default="heuristic", choices=["heuristic", "solver", "random"],
+                    help="heuristic: both sides; solver: the enemy uses draft_solver; "
+                         "random: both pick at random (for --card-strength)")
+    ap.add_argument("--card-strength", help="write learned per-card strengths here (JSON)")
+    ap.add_argument("--mcts-workers", type=int, default=1,
+                    help="root-parallel search processes per MCTS controller (needs --workers 1)")
+    args = ap.parse_args(argv)
+    if args.workers is None:
+        args.workers = 1 if args.mcts_workers > 1 else os.cpu_count() or 1
+    if args.mcts_workers > 1 and args.workers > 1:
+        ap.error("--mcts-workers needs --workers 1 (pool games cannot start nested pools)")
+
+    seeds = range(args.seed, args.seed + args.games)
+    start = time.perf_counter()
+    if args.workers <= 1:
+        _init_log(args.log_level, args.log_file)
+        results = [play_game(s, args.max_turns, args.player_cpu, args.enemy_cpu, args.draft,
+                             args.mcts_workers)
+                   for s in seeds]
+        decision_log.close_sink()
+    else:
+        chunk = max(1, args.games // (args.workers * 8))
+        with Pool(args.workers, initializer=_init_log,
+                  initargs=(args.log_level, args.log_file)) as pool:
+            jobs = [(s, args.max_turns, args.player_cpu, args.enemy_cpu, args.draft)
+                    for s in seeds]
+            results = pool.starmap(play_game, jobs, chunksize=chunk)
+    elapsed = time.perf_counter() - start
+
+    stats = aggregate(results)
+    print_report(stats, elapsed)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"stats": stats, "results": results}, f, indent=1)
+    if args.card_strength:
+        with open(args.card_strength, "w") as f:
+            json.dump(card_strengths(stats), f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,16 @@
 """
 Stealing Phase — 4K Premium Card Draft System
 Each player gets 5 cards, then STEAL or RETAIN until both have 3.
+Rules live in draft.py; this class only draws them and routes input.
 """
 import pygame
-import random
 import os
-import json
 import math
 from config import WIDTH, HEIGHT, FPS, PADDING_SM, PADDING_MD, PADDING_LG, PADDING_XL, RADIUS_SM, RADIUS_MD, RADIUS_LG
-from card import Card
-from attack import Attack
+from draft import Draft, CARD_POOL
+from animations import fx_rng
 from colors import *
 
-# ═══════════════════════════════════════
-# JSON Card Pool
-# ═══════════════════════════════════════
-def load_card_data():
-    json_path = os.path.join(os.path.dirname(__file__), "cards.json")
-    with open(json_path, 'r') as f:
-        data = json.load(f)
-    return data["cards"]
-
-CARD_POOL = load_card_data()
-
 def get_asset_name(card_data):
     return card_data.get("asset", "1.jpg")
 
@@ -47,8 +35,8 @@ CARD_SPACING = 216     # 27 × 8
 CARD_IMAGE_HEIGHT = 152  # 19 × 8
 
 
-class StealingPhase:
-    def __init__(self, screen):
+class StealingPhase(Draft):
+    def __init__(self, screen, rng=None, solver=None):
         self.screen = screen
         self.frame = 0
 
@@ -73,30 +61,23 @@ class StealingPhase:
         self._bg_hex = []
         for _ in range(40):
             self._bg_hex.append({
-                "x": random.uniform(0, WIDTH),
-                "y": random.uniform(0, HEIGHT),
-                "phase": random.uniform(0, math.pi * 2),
-                "size": random.uniform(1, 2.5),
+                "x": fx_rng.uniform(0, WIDTH),
+                "y": fx_rng.uniform(0, HEIGHT),
+                "phase": fx_rng.uniform(0, math.pi * 2),
+                "size": fx_rng.uniform(1, 2.5),
             })
 
-        self.reset()
+        super().__init__(rng, solver)
 
     def reset(self):
-        shuffled = random.sample(range(len(CARD_POOL)), min(10, len(CARD_POOL)))
-        self.player_hand = shuffled[:5]
-        self.cpu_hand = shuffled[5:10]
-        self.player_deck = []
-        self.cpu_deck = []
-        self.current_turn = "player"
-        self.phase_complete = False
+        super().reset()
         self.selected_card = None
         self.hovered_card = None
-        self.action_message = "Your turn: Click YOUR card to RETAIN or OPPONENT's card to STEAL"
         self.cpu_rects = []
         self.player_rects = []
 
-    def get_card_data(self, idx):
-        return CARD_POOL[idx]
+    def on_cpu_turn(self):
+        pygame.time.set_timer(pygame.USEREVENT + 1, 1000)
 
     # ═══════════════════════════════════════
     # CARD RENDERING (Premium Design)
@@ -370,130 +351,3 @@ class StealingPhase:
             if rect.collidepoint(pos):
                 self.steal_card(i)
                 return
-
-    # ═══════════════════════════════════════
-    # GAME LOGIC
-    # ═══════════════════════════════════════
-    def retain_card(self, owner, idx):
-        if owner == "player" and len(self.player_deck) < 3:
-            card_idx = self.player_hand.pop(idx)
-            self.player_deck.append(card_idx)
-            self.action_message = f"Retained {CARD_POOL[card_idx]['name']}!"
-            print(f"[Steal] Player Retained {CARD_POOL[card_idx]['name']}")
-            self.end_turn()
-
-    def steal_card(self, idx):
-        if len(self.player_deck) < 3 and idx < len(self.cpu_hand):
-            card_idx = self.cpu_hand.pop(idx)
-            self.player_deck.append(card_idx)
-            self.action_message = f"Stole {CARD_POOL[card_idx]['name']}!"
-            print(f"[Steal] Player Stole {CARD_POOL[card_idx]['name']}")
-            self.end_turn()
-
-    def end_turn(self):
-        self.check_phase_complete()
-        if not self.phase_complete:
-            self.current_turn = "cpu" if self.current_turn == "player" else "player"
-            if self.current_turn == "cpu":
-                pygame.time.set_timer(pygame.USEREVENT + 1, 1000)
-
-    def _card_score(self, card_idx):
-        data = CARD_POOL[card_idx]
-        return data["hp"] + sum(a["damage"] for a in data.get("attacks", []))
-
-    def cpu_turn(self):
-        player_scores = [(self._card_score(ci), i) for i, ci in enumerate(self.player_hand)]
-        cpu_scores = [(self._card_score(ci), i) for i, ci in enumerate(self.cpu_hand)]
-        player_scores.sort(key=lambda x: x[0], reverse=True)
-        cpu_scores.sort(key=lambda x: x[0])
-
-        # Aggressive steal
-        if player_scores and cpu_scores:
-            best_ps, best_pi = player_scores[0]
-            worst_cs, worst_ci = cpu_scores[0]
-            if best_ps > worst_cs + 20:
-                stolen = self.player_hand.pop(best_pi)
-                if len(self.cpu_deck) < 3:
-                    self.cpu_deck.append(stolen)
-                    self.action_message = f"CPU aggressively stole {CARD_POOL[stolen]['name']}!"
-                    self.end_turn()
-                    return
-                else:
-                    worst_ds, worst_di = 99999, -1
-                    for i, ci in enumerate(self.cpu_deck):
-                        s = self._card_score(ci)
-                        if s < worst_ds:
-                            worst_ds, worst_di = s, i
-                    disc = self.cpu_deck.pop(worst_di)
-                    self.cpu_deck.append(stolen)
-                    self.action_message = f"CPU swapped {CARD_POOL[disc]['name']} for {CARD_POOL[stolen]['name']}!"
-                    self.end_turn()
-                    return
-
-        if len(self.cpu_deck) >= 3:
-            if self.player_hand:
-                best_ss, best_si = 0, -1
-                for i, ci in enumerate(self.player_hand):
-                    s = self._card_score(ci)
-                    if s > best_ss:
-                        best_ss, best_si = s, i
-                worst_ds, worst_di = 9999, -1
-                for i, ci in enumerate(self.cpu_deck):
-                    s = self._card_score(ci)
-                    if s < worst_ds:
-                        worst_ds, worst_di = s, i
-                if best_ss > worst_ds + 15:
-                    stolen = self.player_hand.pop(best_si)
-                    disc = self.cpu_deck.pop(worst_di)
-                    self.cpu_deck.append(stolen)
-                    self.action_message = f"CPU SWAPPED for {CARD_POOL[stolen]['name']}!"
-                    self.end_turn()
-                    return
-            self.current_turn = "player"
-            return
-
-        # Standard steal vs retain
-        best_ss, best_si = 0, -1
-        for i, ci in enumerate(self.player_hand):
-            s = self._card_score(ci)
-            if s > best_ss:
-                best_ss, best_si = s, i
-
-        best_rs, best_ri = 0, -1
-        for i, ci in enumerate(self.cpu_hand):
-            s = self._card_score(ci)
-            if s > best_rs:
-                best_rs, best_ri = s, i
-
-        if best_ss > best_rs * 1.1 and best_si >= 0 and self.player_hand:
-            ci = self.player_hand.pop(best_si)
-            self.cpu_deck.append(ci)
-            self.action_message = f"CPU stole {CARD_POOL[ci]['name']}!"
-        elif best_ri >= 0 and self.cpu_hand:
-            ci = self.cpu_hand.pop(best_ri)
-            self.cpu_deck.append(ci)
-            self.action_message = f"CPU retained {CARD_POOL[ci]['name']}"
-
-        self.end_turn()
-
-    def check_phase_complete(self):
-        if len(self.player_deck) >= 3 and len(self.cpu_deck) >= 3:
-            self.phase_complete = True
-            self.action_message = "Stealing Phase Complete! Press SPACE to begin battle!"
-
-    def create_card_from_pool(self, idx, owner, slot):
-        data = CARD_POOL[idx]
-        attacks = [Attack(a["name"], a["damage"], a["element"], a["range"],
-                          a.get("animation", "projectile_fire")) for a in data.get("attacks", [])]
-        card = Card(
-            owner=owner, name=data["name"], hp=data["hp"], max_hp=data["hp"],
-            attacks=attacks, move_range=data.get("move", 3),
-            element=data["element"], index=slot
-        )
-        card.display_hp = card.hp
-        return card
-
-    def get_final_decks(self):
-        player_cards = [self.create_card_from_pool(idx, "player", i) for i, idx in enumerate(self.player_deck)]
-        cpu_cards = [self.create_card_from_pool(idx, "enemy", i) for i, idx in enumerate(self.cpu_deck)]
-        return player_cards, cpu_cards
@@ -0,0 +1,114 @@
+"""
+GUI side of player and CPU actions: validates input against the engine,
+plays the animation and applies the rules when it lands.
+"""
+from game_grid import cell_center
+from animations import anim_mgr
+from cpu_worker import cpu_worker
+from logic_attack import is_heal_attack
+
+
+def initiate_player_attack(game, player_idx, attack_idx, enemy_idx):
+    if anim_mgr.blocking:
+        return None
+
+    grid = game.grid
+    pc_pos = grid.find_unit("player", player_idx)
+    ec_pos = grid.find_unit("enemy", enemy_idx)
+
+    if not pc_pos or not ec_pos:
+        return False
+
+    attacker = grid.tiles[pc_pos[0]][pc_pos[1]].card
+    atk = attacker.attacks[attack_idx]
+
+    if not game.in_attack_range(pc_pos, ec_pos, atk):
+        anim_mgr.add_floating_text(
+            "OUT OF RANGE!",
+            *cell_center(*pc_pos),
+            (255,180,0)
+        )
+        return False
+
+    # Get animation type from attack
+    anim_type = getattr(atk, 'animation', None)
+    if anim_type is None:
+        # Fallback based on element
+        anim_type = f"projectile_{atk.element}" if atk.element != "null" else "beam_null"
+
+    # Heal attacks: animation targets self instead of enemy
+    anim_target = cell_center(*pc_pos) if is_heal_attack(atk) else cell_center(*ec_pos)
+
+    anim_mgr.trigger_attack_anim(
+        cell_center(*pc_pos),
+        anim_target,
+        atk.element,
+        lambda: game.attack(pc_pos, ec_pos, atk),
+        anim_type=anim_type
+    )
+
+    return True
+
+
+def execute_cpu_action(game, action, then=None):
+    """Animate a CPU action chosen by the engine, applying it on arrival (then call then())."""
+    if not action:
+        return
+
+    def land():
+        game.apply(action)
+        if then:
+            then()
+
+    if action['type'] == 'MOVE':
+        card = action['card']
+        new_pos = action['new_pos']
+        anim_mgr.trigger_move_anim(
+            cell_center(*action['pos']),
+            cell_center(*new_pos),
+            land
+        )
+        anim_mgr.add_floating_text(f"Moving {card.name}", cell_center(*new_pos)[0], cell_center(*new_pos)[1] - 40, (255, 255, 255))
+
+    elif action['type'] == 'ATTACK':
+        pos = action['pos']
+        anim_mgr.trigger_attack_anim(
+            cell_center(*pos),
+            cell_center(*action['target']),
+            action['attack'].element,
+            land
+        )
+        anim_mgr.add_floating_text(f"Attacking!", cell_center(*pos)[0], cell_center(*pos)[1] - 40, (255, 50, 50))
+
+
+def execute_cpu_turn(game, actions):
+    """
+    Animate a CPU turn one action after another, each starting when the
+    previous one lands. Steps the landed rolls made pointless or illegal
+    (Game.is_playable) are skipped.
+    """
+    actions = list(actions)
+    while actions and not game.is_playable(actions[0]):
+        actions.pop(0)
+    if actions:
+        execute_cpu_action(game, actions[0], lambda: execute_cpu_turn(game, actions[1:]))
+
+
+def cpu_turn(game):
+    """
+    Start the CPU thinking in the background. Input stays blocked (via
+    anim_mgr.blocking) until poll_cpu_turn() has handed the turn over.
+    """
+    if anim_mgr.blocking or cpu_worker.busy:
+        return
+    anim_mgr.blocking = True
+    cpu_worker.start(game)
+
+
+def poll_cpu_turn(game):
+    """Call once per frame: animate the CPU's turn as soon as it is decided."""
+    done, actions = cpu_worker.poll()
+    if not done:
+        return
+    anim_mgr.blocking = False
+    execute_cpu_turn(game, actions)
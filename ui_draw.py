@@ -1,13 +1,13 @@
 import pygame
-import random
 import math
 
 from config import *
 from colors import *
 from fonts import *
 from game_grid import cell_center
-from animations import anim_mgr
-from effects import flame_tiles
+from animations import anim_mgr, fx_rng
+from card_view import view_of
+from cpu_worker import cpu_worker
 
 # ═══════════════════════════════════════════════════════
 # GLOBAL CACHES
@@ -21,13 +21,13 @@ _frame_count = 0
 ambient_particles = []
 for _ in range(50):
     ambient_particles.append({
-        "x": random.uniform(0, WIDTH),
-        "y": random.uniform(0, GRID_ROWS * TILE_SIZE),
-        "size": random.uniform(1.0, 2.5),
-        "alpha": random.randint(15, 45),
-        "speed_x": random.uniform(-0.12, 0.12),
-        "speed_y": random.uniform(-0.08, 0.08),
-        "phase": random.uniform(0, math.pi * 2),
+        "x": fx_rng.uniform(0, WIDTH),
+        "y": fx_rng.uniform(0, GRID_ROWS * TILE_SIZE),
+        "size": fx_rng.uniform(1.0, 2.5),
+        "alpha": fx_rng.randint(15, 45),
+        "speed_x": fx_rng.uniform(-0.12, 0.12),
+        "speed_y": fx_rng.uniform(-0.08, 0.08),
+        "phase": fx_rng.uniform(0, math.pi * 2),
     })
 
 
@@ -58,14 +58,14 @@ def spawn_confetti():
     confetti_particles.clear()
     for _ in range(200):
         confetti_particles.append({
-            "x": random.randint(0, WIDTH),
-            "y": random.randint(-HEIGHT, 0),
-            "vy": random.uniform(1.5, 4.0),
-            "vx": random.uniform(-0.5, 0.5),
-            "color": random.choice(C_CONFETTI),
-            "size": random.randint(3, 7),
-            "rot": random.uniform(0, 360),
-            "rot_speed": random.uniform(-4, 4),
+            "x": fx_rng.randint(0, WIDTH),
+            "y": fx_rng.randint(-HEIGHT, 0),
+            "vy": fx_rng.uniform(1.5, 4.0),
+            "vx": fx_rng.uniform(-0.5, 0.5),
+            "color": fx_rng.choice(C_CONFETTI),
+            "size": fx_rng.randint(3, 7),
+            "rot": fx_rng.uniform(0, 360),
+            "rot_speed": fx_rng.uniform(-4, 4),
         })
 
 
@@ -75,8 +75,8 @@ def update_and_draw_confetti(screen):
         p["x"] += p["vx"]
         p["rot"] += p["rot_speed"]
         if p["y"] > HEIGHT:
-            p["y"] = random.randint(-60, -10)
-            p["x"] = random.randint(0, WIDTH)
+            p["y"] = fx_rng.randint(-60, -10)
+            p["x"] = fx_rng.randint(0, WIDTH)
         s = pygame.Surface((p["size"], p["size"]), pygame.SRCALPHA)
         s.fill((*p["color"], 210))
         rotated = pygame.transform.rotate(s, p["rot"])
@@ -133,6 +133,15 @@ def draw_ui(
 
     _draw_ambient(screen, _frame_count)
 
+    # ─── Selection ranges (cached on the grid, once per frame) ───
+    move_reach = atk_reach = frozenset()
+    if selected_pos:
+        sc, sr = selected_pos
+        sel_card = grid.tiles[sc][sr].card
+        if sel_card and sel_card.owner == "player":
+            move_reach = frozenset(grid.movegen.moves((sc, sr)))
+            atk_reach = grid.reachable((sc, sr), sel_card.features.reach)
+
     # ═════════════════════════════════════
     # GRID TILES
     # ═════════════════════════════════════
@@ -151,19 +160,19 @@ def draw_ui(
             pygame.draw.rect(screen, C_ACCENT_DARK, tile_rect, 1)
 
             # Flame tiles
-            for ft in flame_tiles:
-                if ft[0] == c and ft[1] == r:
-                    alpha = int((ft[2] / (FPS * 3)) * 200)
-                    flame = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-                    pygame.draw.rect(flame, (*E_FIRE, alpha // 3), (0, 0, TILE_SIZE, TILE_SIZE), border_radius=4)
-                    pad = TILE_SIZE // 6
-                    pygame.draw.rect(flame, (*E_FIRE_GLOW, alpha // 2),
-                                     (pad, pad, TILE_SIZE - pad * 2, TILE_SIZE - pad * 2), border_radius=4)
-                    for _ in range(2):
-                        fx = random.randint(pad, TILE_SIZE - pad)
-                        fy = random.randint(pad, TILE_SIZE - pad)
-                        pygame.draw.circle(flame, (*E_FIRE_GLOW, alpha), (fx, fy), random.randint(2, 4))
-                    screen.blit(flame, (tx, ty))
+            flame_here = grid.effects.flame_at(c, r)
+            if flame_here:
+                alpha = int((grid.effects.left(flame_here[0]) / (TICK_RATE * 3)) * 200)
+                flame = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+                pygame.draw.rect(flame, (*E_FIRE, alpha // 3), (0, 0, TILE_SIZE, TILE_SIZE), border_radius=4)
+                pad = TILE_SIZE // 6
+                pygame.draw.rect(flame, (*E_FIRE_GLOW, alpha // 2),
+                                 (pad, pad, TILE_SIZE - pad * 2, TILE_SIZE - pad * 2), border_radius=4)
+                for _ in range(2):
+                    fx = fx_rng.randint(pad, TILE_SIZE - pad)
+                    fy = fx_rng.randint(pad, TILE_SIZE - pad)
+                    pygame.draw.circle(flame, (*E_FIRE_GLOW, alpha), (fx, fy), fx_rng.randint(2, 4))
+                screen.blit(flame, (tx, ty))
 
             # Hover
             if (c, r) == hovered_cell and r < GRID_ROWS:
@@ -173,26 +182,16 @@ def draw_ui(
                 screen.blit(hov, (tx, ty))
 
             # Selection ranges
-            if selected_pos:
-                sc, sr = selected_pos
-                sel_card = grid.tiles[sc][sr].card
-                if sel_card and sel_card.owner == "player":
-                    from game_grid import bfs_reachable
-
-                    move_reach = bfs_reachable((sc, sr), sel_card.move_range, grid)
-                    if (c, r) in move_reach:
-                        pulse = 18 + int(8 * math.sin(_frame_count * 0.06))
-                        m = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-                        m.fill((*C_PLAYER, pulse))
-                        pygame.draw.rect(m, (*C_PLAYER_GLOW, 35), (0, 0, TILE_SIZE, TILE_SIZE), 1, border_radius=2)
-                        screen.blit(m, (tx, ty))
-
-                    max_range = max(atk.attack_range for atk in sel_card.attacks)
-                    atk_reach = bfs_reachable((sc, sr), max_range, grid)
-                    if (c, r) in atk_reach and (c, r) not in move_reach:
-                        a = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-                        a.fill((*C_WARNING, 12))
-                        screen.blit(a, (tx, ty))
+            if (c, r) in move_reach:
+                pulse = 18 + int(8 * math.sin(_frame_count * 0.06))
+                m = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+                m.fill((*C_PLAYER, pulse))
+                pygame.draw.rect(m, (*C_PLAYER_GLOW, 35), (0, 0, TILE_SIZE, TILE_SIZE), 1, border_radius=2)
+                screen.blit(m, (tx, ty))
+            elif (c, r) in atk_reach:
+                a = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+                a.fill((*C_WARNING, 12))
+                screen.blit(a, (tx, ty))
 
     # ═════════════════════════════════════
     # CARDS ON GRID
@@ -204,9 +203,8 @@ def draw_ui(
                 continue
 
             cx, cy = cell_center(c, r)
-            if card.display_hp is None:
-                card.display_hp = card.hp
-            card.display_hp = card.hp
+            view = view_of(card)
+            view.display_hp = card.hp
 
             elem_c = ELEM_COLORS.get(card.element, E_NULL)
             elem_g = ELEM_GLOW.get(card.element, E_NULL_GLOW)
@@ -214,12 +212,12 @@ def draw_ui(
             owner_g = C_PLAYER_GLOW if card.owner == "player" else C_ENEMY_GLOW
 
             body_c = owner_c
-            if card.flash_timer > 0:
+            if view.flash_timer > 0:
                 body_c = C_WHITE
-                card.flash_timer -= 1
-            elif card.heal_flash_timer > 0:
+                view.flash_timer -= 1
+            elif view.heal_flash_timer > 0:
                 body_c = C_SUCCESS
-                card.heal_flash_timer -= 1
+                view.heal_flash_timer -= 1
 
             # Selection glow
             if selected_pos == (c, r):
@@ -257,9 +255,9 @@ def draw_ui(
                 screen.blit(ls, (cx - TILE_SIZE // 2, cy - TILE_SIZE // 2))
 
             # Heal ring
-            if card.heal_flash_timer > 0:
+            if view.heal_flash_timer > 0:
                 hs = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-                ha = int(150 * (card.heal_flash_timer / 10))
+                ha = int(150 * (view.heal_flash_timer / 10))
                 pygame.draw.circle(hs, (*C_SUCCESS, ha), (TILE_SIZE // 2, TILE_SIZE // 2), TILE_SIZE // 2 - 2, 4)
                 screen.blit(hs, (cx - TILE_SIZE // 2, cy - TILE_SIZE // 2))
 
@@ -271,7 +269,7 @@ def draw_ui(
             screen.blit(lt, (cx - lt.get_width() // 2, cy - lt.get_height() // 2))
 
             # HP bar
-            hp_ratio = max(0, card.display_hp / card.max_hp)
+            hp_ratio = max(0, view.display_hp / card.max_hp)
             bar_w, bar_h = TILE_SIZE - 8, 10
             hx = cx - bar_w // 2
             hy = cy - TILE_SIZE // 2 - PADDING_SM - bar_h
@@ -316,17 +314,15 @@ def draw_ui(
     base_y = panel_y + 10
 
     # ── Gather all cards on the grid ──
-    player_cards = []
-    enemy_cards = []
-    for gc in range(grid.cols):
-        for gr in range(grid.rows):
-            cd = grid.tiles[gc][gr].card
-            if cd and cd.owner == "player":
-                player_cards.append(cd)
-            elif cd and cd.owner == "enemy":
-                enemy_cards.append(cd)
-    player_cards.sort(key=lambda c: c.index)
-    enemy_cards.sort(key=lambda c: c.index)
+    def _cards_by_index(owner):
+        out = []
+        for idx in sorted(grid.units.get(owner, ())):
+            gc, gr = grid.unit_pos[(owner, idx)]
+            out.append(grid.tiles[gc][gr].card)
+        return out
+
+    player_cards = _cards_by_index("player")
+    enemy_cards = _cards_by_index("enemy")
 
     # ── Which player card is selected? ──
     sel_card_idx = -1
@@ -481,7 +477,10 @@ def draw_ui(
     cw = center_w - PADDING_MD * 2
 
     # Turn badge
-    turn_label = "ENEMY TURN" if anim_mgr.blocking else "YOUR TURN"
+    if cpu_worker.busy:
+        turn_label = "CPU THINKING" + "." * (_frame_count // 15 % 4)
+    else:
+        turn_label = "ENEMY TURN" if anim_mgr.blocking else "YOUR TURN"
     turn_color = C_ENEMY_GLOW if anim_mgr.blocking else C_PLAYER_GLOW
     badge_w = min(220, cw)
     badge_rect = pygame.Rect(cx + (cw - badge_w) // 2, base_y, badge_w, 32)